@@ -0,0 +1,82 @@
+import json
+import os
+import tempfile
+from timeit import default_timer
+
+from package_manager.api_cache import APICache
+from package_manager.api_cache import CacheItem
+
+
+def make_release(index: int) -> dict:
+    return {
+        'tag_name': f'v{index}',
+        'prerelease': False,
+        'body': 'Changes\n' * 50,
+        'assets': [{'name': f'asset_{index}.zip', 'browser_download_url': 'https://example.com/' * 4}],
+    }
+
+
+def make_cache_data(repo_count: int) -> dict:
+    data = {}
+    for repo in range(repo_count):
+        for page in range(1, 4):
+            url = f'https://api.github.com/repos/owner/repo{repo}/releases?page={page}'
+            data[url] = CacheItem([make_release(i) for i in range(30)], etag=f'"{repo}-{page}"').to_json()
+    return data
+
+
+def per_call_file_roundtrip(file_path: str, urls: list[str]) -> float:
+    # Previous behaviour: parse the whole file before each call and rewrite it after each one
+    start = default_timer()
+    for url in urls:
+        with open(file_path) as file:
+            data = json.load(file)
+        data[url] = CacheItem([], etag='"new"').to_json()
+        with open(file_path, 'w') as file:
+            json.dump(data, file)
+    return default_timer() - start
+
+
+def session_cache(file_path: str, urls: list[str]) -> float:
+    start = default_timer()
+    cache = APICache(file_path + '.db', legacy_file_path=file_path)
+    for url in urls:
+        cache.get(url)
+        cache.set(url, CacheItem([], etag='"new"'))
+    cache.close()
+    return default_timer() - start
+
+
+def single_entry_update(file_path: str, urls: list[str]) -> float:
+    # Updating one entry of an already populated cache
+    cache = APICache(file_path + '.db', legacy_file_path=file_path)
+    len(cache)
+    cache.close()
+    start = default_timer()
+    for url in urls:
+        cache = APICache(file_path + '.db')
+        cache.get(url)
+        cache.set(url, CacheItem([], etag='"newer"'))
+        cache.close()
+    return default_timer() - start
+
+
+def main() -> None:
+    repo_count = 40
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = os.path.join(temp_dir, 'github_api_cache')
+        data = make_cache_data(repo_count)
+        urls = list(data)
+        for bench in (per_call_file_roundtrip, session_cache, single_entry_update):
+            if os.path.exists(file_path + '.db'):
+                os.remove(file_path + '.db')
+            with open(file_path, 'w') as file:
+                json.dump(data, file)
+            file_size = os.path.getsize(file_path)
+            elapsed = bench(file_path, urls)
+            print(f'{bench.__name__:>24}: {elapsed * 1000 / len(urls):8.3f} ms per call '
+                  f'({len(urls)} calls, {file_size / 1024 / 1024:.1f} MB cache)')
+
+
+if __name__ == '__main__':
+    main()
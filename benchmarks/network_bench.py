@@ -0,0 +1,59 @@
+import json
+from http.server import BaseHTTPRequestHandler
+from time import sleep
+from timeit import default_timer
+
+import requests
+
+from package_manager import network
+from package_manager.conftest import LocalServer
+
+
+# Emulates the TCP + TLS handshake round trips of a real connection to api.github.com
+HANDSHAKE_DELAY = 0.02
+
+
+class GitHubStandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep-alive
+    disable_nagle_algorithm = True
+
+    def setup(self) -> None:
+        sleep(HANDSHAKE_DELAY)
+        super(GitHubStandInHandler, self).setup()
+
+    def do_GET(self) -> None:
+        body = json.dumps({'tag_name': 'v1.0.0', 'pushed_at': '2020-01-01T00:00:00Z'}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+def update_check(get, base_url: str, repo_count: int) -> float:
+    start = default_timer()
+    for repo in range(repo_count):
+        get(f'{base_url}/repos/owner/repo{repo}').json()
+        get(f'{base_url}/repos/owner/repo{repo}/releases/latest').json()
+    return default_timer() - start
+
+
+def main() -> None:
+    repo_count = 50
+    server = LocalServer(GitHubStandInHandler)
+    try:
+        bare = update_check(lambda url: requests.get(url, timeout=5), server.url, repo_count)
+        pooled = update_check(network.get, server.url, repo_count)
+    finally:
+        server.close()
+    print(f'{repo_count}-repo update check, {repo_count * 2} requests, '
+          f'{HANDSHAKE_DELAY * 1000:.0f} ms emulated handshake')
+    print(f'     requests.get: {bare * 1000:8.1f} ms')
+    print(f'  pooled session: {pooled * 1000:8.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
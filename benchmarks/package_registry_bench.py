@@ -0,0 +1,81 @@
+import json
+import os
+import tempfile
+import time
+from timeit import default_timer
+
+from package_manager.package_registry import PackageRegistry
+
+
+# Simulated cost of a file access on a network drive, in seconds
+NETWORK_LATENCY = 0.002
+
+
+class PackageStandIn:
+    # Reads the same files as LocalPackage, which can't be created without Houdini
+    latency = 0.0
+
+    def __init__(self, package_file: str) -> None:
+        time.sleep(self.latency * 3)  # Package file, content folder and package.setup
+        with open(package_file) as file:
+            data = json.load(file)
+        self.content_path = data['path']
+        os.listdir(self.content_path)
+        with open(os.path.join(self.content_path, 'package.setup')) as file:
+            self.setup = json.load(file)
+
+    def dependencies(self) -> tuple[str, ...]:
+        return self.content_path, os.path.join(self.content_path, 'package.setup')
+
+
+def make_packages(root: str, count: int) -> list[str]:
+    paths = []
+    for index in range(count):
+        content_path = os.path.join(root, 'content', f'package_{index}')
+        for folder in ('otls', 'scripts', 'toolbar'):
+            os.makedirs(os.path.join(content_path, folder))
+        with open(os.path.join(content_path, 'package.setup'), 'w') as file:
+            json.dump({'name': f'package_{index}', 'version': '1.0.0', 'author': 'Author'}, file)
+        package_file = os.path.join(root, f'package_{index}.json')
+        with open(package_file, 'w') as file:
+            json.dump({'path': content_path, 'env': [{'VAR': f'{index}'}]}, file)
+        paths.append(package_file)
+    return paths
+
+
+def main() -> None:
+    count = 500
+    with tempfile.TemporaryDirectory() as root:
+        paths = make_packages(root, count)
+        registry = PackageRegistry(PackageStandIn, PackageStandIn.dependencies)
+
+        start = default_timer()
+        for path in paths:
+            PackageStandIn(path)
+        print(f'{count} packages, parsing all: {(default_timer() - start) * 1000:.1f} ms')
+
+        start = default_timer()
+        registry.refresh(paths)
+        print(f'Cold refresh: {(default_timer() - start) * 1000:.1f} ms')
+
+        start = default_timer()
+        registry.refresh(paths)
+        print(f'Warm refresh: {(default_timer() - start) * 1000:.1f} ms')
+
+        stat = os.stat(paths[0])
+        os.utime(paths[0], ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        start = default_timer()
+        registry.refresh(paths)
+        print(f'Refresh with 1 changed package: {(default_timer() - start) * 1000:.1f} ms')
+
+        PackageStandIn.latency = NETWORK_LATENCY
+        print(f'With {NETWORK_LATENCY * 1000:.0f} ms latency per file:')
+        for max_workers in (1, 4, 8, 16):
+            registry = PackageRegistry(PackageStandIn, PackageStandIn.dependencies)
+            start = default_timer()
+            registry.refresh(paths, max_workers)
+            print(f'Cold refresh, {max_workers} workers: {(default_timer() - start) * 1000:.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+import random
+from timeit import default_timer
+
+from package_manager.search_index import SearchIndex
+
+
+WORDS = ('pyro', 'fluid', 'motion', 'rig', 'crowd', 'terrain', 'vellum', 'tools', 'shader', 'library',
+         'export', 'import', 'usd', 'solaris', 'vex', 'python', 'panel', 'shelf', 'asset', 'procedural')
+
+
+def make_documents(count: int) -> list[dict]:
+    rng = random.Random(0)
+    return [
+        {
+            'name': f'{rng.choice(WORDS)}_{rng.choice(WORDS)}_{index}',
+            'description': ' '.join(rng.choice(WORDS) for _ in range(12)),
+            'author': f'author_{index % 300}',
+            'status': rng.choice(('stable', 'beta', 'alpha')),
+            'license': rng.choice(('apprentice', 'indie', 'commercial')),
+        }
+        for index in range(count)
+    ]
+
+
+def scan(documents: list[dict], query: str) -> set[int]:
+    # Substring search over every field of every document
+    words = query.lower().split()
+    return {index for index, document in enumerate(documents)
+            if all(any(word in (value or '').lower() for value in document.values()) for word in words)}
+
+
+def main() -> None:
+    count = 5000
+    documents = make_documents(count)
+    fields = ('name', 'description', 'author', 'status', 'license')
+
+    start = default_timer()
+    index = SearchIndex(fields)
+    for document in documents:
+        index.add(document)
+    print(f'{count} packages, index built in {(default_timer() - start) * 1000:.1f} ms')
+
+    query = 'procedural terrain status:beta'
+    for typed in (query[:length] for length in range(1, len(query) + 1)):
+        start = default_timer()
+        scan(documents, typed)
+        scan_time = default_timer() - start
+
+        start = default_timer()
+        matching = index.search(typed)
+        index_time = default_timer() - start
+        matching_count = count if matching is None else len(matching)
+        print(f'{typed!r:34} scan {scan_time * 1000:6.2f} ms, index {index_time * 1000:6.2f} ms, '
+              f'{matching_count} matching')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+import os
+import tempfile
+from operator import itemgetter
+from timeit import default_timer
+
+from package_manager.package import package_score
+from package_manager.setup_schema import make_setup_schema
+
+
+def make_tree(root: str) -> None:
+    # A repository with a package several levels deep, a deep Python library,
+    # lots of digital assets with backups, a Git folder and textures
+    def write(path: str, count: int, name: str) -> None:
+        os.makedirs(path, exist_ok=True)
+        for index in range(count):
+            open(os.path.join(path, name.format(index)), 'w').close()
+
+    package_path = os.path.join(root, 'repo', 'houdini')
+    write(os.path.join(package_path, 'otls'), 200, 'asset_{}.hda')
+    write(os.path.join(package_path, 'otls', 'backup'), 600, 'asset_{}_bak.hda')
+    for context in ('sop', 'lop', 'dop', 'top', 'cop2', 'vop', 'obj', 'rop'):
+        write(os.path.join(package_path, 'hda', context), 100, 'asset_{}.hda')
+        write(os.path.join(package_path, 'hda', context, 'backup'), 300, 'asset_{}_bak.hda')
+    for folder in ('scripts', 'toolbar', 'python_panels', 'viewer_states', 'vex'):
+        write(os.path.join(package_path, folder), 20, 'file_{}.py')
+    for module in range(20):
+        module_path = os.path.join(package_path, 'python3.9libs', 'library', f'module_{module}')
+        for depth in range(6):
+            module_path = os.path.join(module_path, f'sub_{depth}')
+            write(module_path, 15, 'file_{}.py')
+    for folder in range(256):
+        write(os.path.join(root, 'repo', '.git', 'objects', f'{folder:02x}'), 10, 'object_{}')
+    for folder in ('wood', 'metal', 'concrete', 'fabric'):
+        write(os.path.join(package_path, 'textures', folder), 200, 'map_{}.exr')
+
+
+# Previous implementation, walking the tree twice and listing every folder twice
+def old_make_setup_schema(path: str) -> dict | None:
+    paths = []
+    scores = []
+    for root, folders, files in os.walk(path):
+        score = package_score(os.listdir(root))
+        if score > 0:
+            paths.append(root)
+            scores.append(score)
+    if not paths:
+        return None
+    package_root_path = sorted(zip(paths, scores, strict=False), key=itemgetter(1))[-1][0]
+
+    hda_roots = []
+    for root, folders, files in os.walk(package_root_path):
+        if root.lower() == os.path.join(package_root_path, 'otls').lower():
+            continue
+        if os.path.basename(root) == 'backup':
+            continue
+        for file in files:
+            if file.endswith(('.otl', '.otlnc', '.otllc', '.hda', '.hdanc', '.hdalc')):
+                hda_roots.append(root)
+                break
+    return {
+        'root': package_root_path.replace(path, '').strip('\\/').replace('\\', '/'),
+        'hda_roots': tuple(p.replace(package_root_path, '').strip('\\/').replace('\\', '/') for p in hda_roots),
+    }
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as root:
+        make_tree(root)
+        file_count = sum(len(files) for _, _, files in os.walk(root))
+        print(f'{file_count} files')
+
+        for name, function in (('os.walk, two passes', old_make_setup_schema),
+                               ('os.scandir, one pass', make_setup_schema)):
+            times = []
+            for _ in range(5):
+                start = default_timer()
+                schema = function(root)
+                times.append(default_timer() - start)
+            print(f'{name:22} {min(times) * 1000:7.1f} ms, root {schema["root"]!r}, '
+                  f'{len(schema["hda_roots"])} HDA roots')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+import random
+from operator import itemgetter
+from timeit import default_timer
+
+from package_manager.version import Version
+from package_manager.version import VersionRange
+from package_manager.web_catalogue import CatalogueIndex
+from package_manager.web_catalogue import catalogue_index
+from package_manager.web_catalogue import make_web_package
+
+
+def make_catalogue(package_count: int) -> dict:
+    rng = random.Random(0)
+    patterns = ('*', '17.5+', '18.0+', '18.5+', '19.0+', '19.5+', '17.0-18.5', '18.0-19.0', '19.0-19.5')
+    return {
+        f'package_{index}': {
+            'description': f'Description of package {index}',
+            'author': f'author_{index % 300}',
+            'source': f'author_{index % 300}/package_{index}',
+            'source_type': 'github',
+            'hversion': rng.choice(patterns),
+            'hlicense': rng.choice(('apprentice', 'indie', 'commercial')),
+            'status': rng.choice(('stable', 'beta', 'alpha')),
+        }
+        for index in range(package_count)
+    }
+
+
+def per_entry(data: dict, hversion: str) -> list:
+    # Previous implementation of WebPackageListModel.update_data
+    version = Version(hversion)
+    packages = []
+    for name, package_data in sorted(data.items(), key=itemgetter(0)):
+        if not package_data.get('visible', True):
+            continue
+        if version not in VersionRange.from_pattern(package_data.get('hversion', '*')):
+            continue
+        packages.append(make_web_package(name, package_data))
+    return packages
+
+
+def main() -> None:
+    package_count = 5000
+    hversion = '19.5.303'
+    data = make_catalogue(package_count)
+    print(f'{package_count} packages')
+
+    start = default_timer()
+    expected = per_entry(data, hversion)
+    print(f'    per entry: {(default_timer() - start) * 1000:7.1f} ms ({len(expected)} matching)')
+
+    start = default_timer()
+    index = CatalogueIndex(data)
+    print(f'  build index: {(default_timer() - start) * 1000:7.1f} ms')
+
+    start = default_timer()
+    packages = index.filter(hversion)
+    print(f' first filter: {(default_timer() - start) * 1000:7.1f} ms')
+    assert [package.name for package in packages] == [package.name for package in expected]
+
+    start = default_timer()
+    index.filter(hversion)
+    print(f'  next filter: {(default_timer() - start) * 1000:7.1f} ms')
+
+    catalogue_index(data, 'etag')
+    start = default_timer()
+    catalogue_index(data, 'etag').filter(hversion)
+    print(f'      refresh: {(default_timer() - start) * 1000:7.1f} ms (index reused)')
+
+
+if __name__ == '__main__':
+    main()
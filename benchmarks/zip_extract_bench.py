@@ -0,0 +1,57 @@
+import os
+import random
+import shutil
+import tempfile
+import zipfile
+from timeit import default_timer
+
+from package_manager.zip_extract import extract_zip
+
+
+def make_archive(file_path: str, file_count: int) -> None:
+    rng = random.Random(0)
+    with zipfile.ZipFile(file_path, 'w', zipfile.ZIP_DEFLATED) as file:
+        for index in range(file_count):
+            folder = f'repo-1a2b3c4/otls/group{index % 100}'
+            size = rng.choice((512, 4096, 32768, 262144))
+            data = rng.randbytes(size // 4) * 4  # Partially compressible
+            file.writestr(f'{folder}/asset{index}.hda', data)
+
+
+def sequential(file_path: str, dst_path: str) -> None:
+    # Previous implementation of extract_repo_zip
+    if os.path.exists(dst_path):
+        shutil.rmtree(dst_path)
+    with zipfile.ZipFile(file_path) as file:
+        repo_root_path = file.namelist()[0].split('/')[0] + '/'
+        for zip_data in file.infolist():
+            if zip_data.filename[-1] == '/':
+                continue
+            zip_data.filename = zip_data.filename.replace(repo_root_path, '')
+            file.extract(zip_data, dst_path)
+
+
+def main() -> None:
+    file_count = 10000
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = os.path.join(temp_dir, 'archive.zip')
+        make_archive(file_path, file_count)
+        archive_size = os.path.getsize(file_path) / 1024 / 1024
+        print(f'{file_count} files, {archive_size:.0f} MB archive')
+
+        start = default_timer()
+        sequential(file_path, os.path.join(temp_dir, 'sequential'))
+        print(f'        sequential: {default_timer() - start:6.2f} s')
+
+        dst_path = os.path.join(temp_dir, 'parallel')
+        start = default_timer()
+        stats = extract_zip(file_path, dst_path)
+        print(f'          parallel: {default_timer() - start:6.2f} s ({stats.extracted} extracted)')
+
+        start = default_timer()
+        stats = extract_zip(file_path, dst_path)
+        print(f' parallel, update: {default_timer() - start:6.2f} s ({stats.skipped} unchanged)')
+
+
+if __name__ == '__main__':
+    main()
@@ -3,6 +3,7 @@ __all__ = [
     'install_package_from_web_link',
     'MainWindow',
     'check_for_updates',
+    'check_for_updates_in_background',
     'UpdateOptions',
 ]
 
@@ -10,4 +11,5 @@ from .install_local import pick_and_install_package_from_folder
 from .install_web import install_package_from_web_link
 from .main_window import MainWindow
 from .update import check_for_updates
+from .update import check_for_updates_in_background
 from .update_options import UpdateOptions
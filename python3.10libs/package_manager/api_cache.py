@@ -0,0 +1,352 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+from collections.abc import Iterable
+from time import time
+from typing import Any
+
+
+class CacheItem:
+    __slots__ = 'data', 'etag', 'last_modified', 'link', 'fetched_at'
+
+    def __init__(
+            self,
+            data: Any,
+            etag: str | None = None,
+            last_modified: float | None = None,
+            link: str | None = None,
+            fetched_at: float | None = None,
+    ):
+        self.data = data
+        self.etag = etag
+        self.last_modified = last_modified
+        self.link = link  # Pagination header
+        self.fetched_at = fetched_at  # Last time the data was received or validated by the server
+
+    def age(self, now: float | None = None) -> float:
+        if self.fetched_at is None:
+            return float('inf')
+        return (time() if now is None else now) - self.fetched_at
+
+    def to_json(self) -> dict:
+        return {
+            'data': self.data,
+            'etag': self.etag,
+            'last_modified': self.last_modified,
+            'link': self.link,
+            'fetched_at': self.fetched_at,
+        }
+
+    @classmethod
+    def from_json(cls, data: dict) -> 'CacheItem':
+        return cls(data['data'], data.get('etag'), data.get('last_modified'), data.get('link'), data.get('fetched_at'))
+
+
+# Freshness of a cached item
+FRESH = 'fresh'  # Can be used without a request
+STALE = 'stale'  # Can be used while it is revalidated in the background
+OUTDATED = 'outdated'  # Has to be revalidated before it is used
+
+
+class CacheStats:
+    __slots__ = 'hits', 'misses', 'expired', 'evicted'
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evicted = 0
+
+
+COLUMNS = (
+    ('url', 'TEXT PRIMARY KEY'),
+    ('data', 'TEXT NOT NULL'),
+    ('etag', 'TEXT'),
+    ('last_modified', 'TEXT'),
+    ('size', 'INTEGER NOT NULL DEFAULT 0'),
+    ('stored_at', 'REAL NOT NULL DEFAULT 0'),
+    ('accessed_at', 'REAL NOT NULL DEFAULT 0'),
+    ('link', 'TEXT'),
+    ('fetched_at', 'REAL'),
+    ('expires_at', 'REAL'),  # Time to live of the URL added to stored_at, NULL if it never expires
+)
+COLUMN_NAMES = ', '.join(name for name, _ in COLUMNS)
+INSERT_COLUMNS = f'({COLUMN_NAMES}) VALUES ({", ".join("?" * len(COLUMNS))})'
+
+
+# Entries are stored one row per URL in an SQLite database, so a lookup reads a single row
+# and a flush writes only the entries changed since the last one, in a single transaction.
+# Entries read or written during the session are kept in memory. Writes only mark them dirty,
+# they are written by flush() after every `flush_every` writes or when the owner decides to
+# (on idle, on exit).
+# The cache is bounded by `max_entries` and `max_bytes` (least recently used entries are evicted
+# first), and by per-URL time to live: `ttl_rules` is a sequence of (regex, seconds) pairs,
+# the first pattern found in the URL wins.
+# `freshness_rules` are (regex, fresh seconds, stale seconds) triples matched the same way: items
+# fetched within the fresh window need no request, within the following stale window they can be
+# served while being revalidated.
+class APICache:
+    def __init__(
+            self,
+            file_path: str,
+            flush_every: int = 25,
+            legacy_file_path: str | None = None,
+            max_entries: int | None = None,
+            max_bytes: int | None = None,
+            ttl_rules: Iterable[tuple[str, float]] = (),
+            freshness_rules: Iterable[tuple[str, float, float]] = (),
+    ) -> None:
+        self.file_path = file_path
+        self.flush_every = flush_every
+        self.legacy_file_path = legacy_file_path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_rules = tuple((re.compile(pattern), ttl) for pattern, ttl in ttl_rules)
+        self.freshness_rules = tuple((re.compile(pattern), fresh, stale) for pattern, fresh, stale in freshness_rules)
+        self.stats = CacheStats()
+
+        self._connection: sqlite3.Connection | None = None
+        self._lock = threading.RLock()
+        self._data: dict[str, CacheItem] = {}
+        self._stored_at: dict[str, float] = {}
+        self._accessed_at: dict[str, float] = {}
+        self._dirty: set[str] = set()
+        self._touched: set[str] = set()  # Revalidated, only their times are written
+
+    def _db(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.file_path, check_same_thread=False)
+            columns = ', '.join(f'{name} {definition}' for name, definition in COLUMNS)
+            self._connection.execute(f'CREATE TABLE IF NOT EXISTS cache ({columns})')
+            existing_columns = {row[1] for row in self._connection.execute('PRAGMA table_info(cache)')}
+            for name, definition in COLUMNS:
+                if name not in existing_columns:
+                    self._connection.execute(f'ALTER TABLE cache ADD COLUMN {name} {definition}')
+            if 'expires_at' not in existing_columns:
+                self._set_expiration_times()
+            self._connection.execute('CREATE INDEX IF NOT EXISTS cache_expires_at ON cache (expires_at)')
+            self._import_legacy_file()
+        return self._connection
+
+    def _import_legacy_file(self) -> None:
+        # Single JSON file used by the previous versions
+        if not self.legacy_file_path or not os.path.isfile(self.legacy_file_path):
+            return
+        try:
+            with open(self.legacy_file_path) as file:
+                legacy_data = json.load(file)
+            now = time()
+            with self._connection:
+                self._connection.executemany(
+                    f'INSERT OR IGNORE INTO cache {INSERT_COLUMNS}',
+                    (self._row(url, CacheItem.from_json(item_data), now, now)
+                     for url, item_data in legacy_data.items()),
+                )
+        except (OSError, ValueError, KeyError, sqlite3.Error):
+            pass
+        try:
+            os.remove(self.legacy_file_path)
+        except OSError:
+            pass
+
+    def _set_expiration_times(self) -> None:
+        # Databases written by the previous versions have no expiration times, done once
+        rows = self._connection.execute('SELECT url, stored_at FROM cache').fetchall()
+        with self._connection:
+            self._connection.executemany('UPDATE cache SET expires_at = ? WHERE url = ?',
+                                         ((self._expires_at(url, stored_at), url) for url, stored_at in rows))
+
+    def _expires_at(self, url: str, stored_at: float) -> float | None:
+        ttl = self.ttl(url)
+        return None if ttl is None else stored_at + ttl
+
+    def _row(self, url: str, item: CacheItem, stored_at: float, accessed_at: float) -> tuple:
+        data = json.dumps(item.data)
+        return (url, data, item.etag, item.last_modified, len(data), stored_at, accessed_at, item.link,
+                item.fetched_at, self._expires_at(url, stored_at))
+
+    def ttl(self, url: str) -> float | None:
+        for pattern, ttl in self.ttl_rules:
+            if pattern.search(url):
+                return ttl
+        return None
+
+    def freshness(self, url: str, item: CacheItem, now: float | None = None) -> str:
+        age = item.age(now)
+        for pattern, fresh, stale in self.freshness_rules:
+            if pattern.search(url):
+                if age < fresh:
+                    return FRESH
+                if age < fresh + stale:
+                    return STALE
+                break
+        return OUTDATED
+
+    def _is_expired(self, url: str, stored_at: float, now: float) -> bool:
+        ttl = self.ttl(url)
+        return ttl is not None and now - stored_at > ttl
+
+    def get(self, url: str) -> CacheItem | None:
+        with self._lock:
+            now = time()
+            if url in self._data:
+                if self._is_expired(url, self._stored_at[url], now):
+                    self.stats.expired += 1
+                    self.stats.misses += 1
+                    self._remove((url,))
+                    return None
+                self.stats.hits += 1
+                self._accessed_at[url] = now
+                return self._data[url]
+
+            row = self._db().execute('SELECT data, etag, last_modified, link, fetched_at, stored_at '
+                                     'FROM cache WHERE url = ?', (url,)).fetchone()
+            if row is None:
+                self.stats.misses += 1
+                return None
+            data, etag, last_modified, link, fetched_at, stored_at = row
+            if self._is_expired(url, stored_at, now):
+                self.stats.expired += 1
+                self.stats.misses += 1
+                self._remove((url,))
+                return None
+            try:
+                item = CacheItem(json.loads(data), etag, last_modified, link, fetched_at)
+            except ValueError:
+                self.stats.misses += 1
+                return None
+            self.stats.hits += 1
+            self._data[url] = item
+            self._stored_at[url] = stored_at
+            self._accessed_at[url] = now
+            return item
+
+    def set(self, url: str, item: CacheItem) -> None:
+        with self._lock:
+            now = time()
+            self._data[url] = item
+            self._stored_at[url] = now
+            self._accessed_at[url] = now
+            self._dirty.add(url)
+            self._touched.discard(url)
+            if len(self._dirty) >= self.flush_every:
+                self.flush()
+
+    def touch(self, url: str, item: CacheItem) -> None:
+        # The server has confirmed the item is unchanged, the data is not written again
+        with self._lock:
+            now = time()
+            item.fetched_at = now
+            if self._data.get(url) is not item:
+                self.set(url, item)
+                return
+            self._stored_at[url] = now
+            self._accessed_at[url] = now
+            if url not in self._dirty:
+                self._touched.add(url)
+            if len(self._dirty) + len(self._touched) >= self.flush_every:
+                self.flush()
+
+    def is_dirty(self) -> bool:
+        return bool(self._dirty or self._touched)
+
+    def flush(self) -> None:
+        with self._lock:
+            if not self._dirty and not self._accessed_at:
+                return
+            rows = [self._row(url, self._data[url], self._stored_at[url], self._accessed_at[url])
+                    for url in self._dirty]
+            touched = [(self._stored_at[url], self._accessed_at[url], self._data[url].fetched_at,
+                        self._expires_at(url, self._stored_at[url]), url)
+                       for url in self._touched]
+            accessed = [(accessed_at, url) for url, accessed_at in self._accessed_at.items()
+                        if url not in self._dirty and url not in self._touched]
+            db = self._db()
+            with db:
+                db.executemany(f'INSERT OR REPLACE INTO cache {INSERT_COLUMNS}', rows)
+                db.executemany('UPDATE cache SET stored_at = ?, accessed_at = ?, fetched_at = ?, expires_at = ? '
+                               'WHERE url = ?', touched)
+                db.executemany('UPDATE cache SET accessed_at = ? WHERE url = ?', accessed)
+            self._dirty.clear()
+            self._touched.clear()
+            self._accessed_at.clear()
+            self.evict()
+
+    def _remove(self, urls: Iterable[str]) -> None:
+        urls = tuple(urls)
+        db = self._db()
+        with db:
+            db.executemany('DELETE FROM cache WHERE url = ?', ((url,) for url in urls))
+        for url in urls:
+            self._data.pop(url, None)
+            self._stored_at.pop(url, None)
+            self._accessed_at.pop(url, None)
+            self._dirty.discard(url)
+            self._touched.discard(url)
+
+    def evict(self) -> None:
+        with self._lock:
+            db = self._db()
+            # Entries kept in memory are checked by get()
+            with db:
+                expired = db.execute('DELETE FROM cache WHERE expires_at < ?', (time(),)).rowcount
+            self.stats.expired += expired
+
+            entries, total_bytes = db.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache').fetchone()
+            if (self.max_entries is None or entries <= self.max_entries) and \
+                    (self.max_bytes is None or total_bytes <= self.max_bytes):
+                return
+
+            evicted = []
+            for url, size in db.execute('SELECT url, size FROM cache ORDER BY accessed_at').fetchall():
+                if (self.max_entries is None or entries <= self.max_entries) and \
+                        (self.max_bytes is None or total_bytes <= self.max_bytes):
+                    break
+                evicted.append(url)
+                entries -= 1
+                total_bytes -= size
+            self._remove(evicted)
+            self.stats.evicted += len(evicted)
+
+    def size(self) -> tuple[int, int]:
+        with self._lock:
+            self.flush()
+            entries, total_bytes = self._db().execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache').fetchone()
+            return entries, total_bytes
+
+    def clear(self) -> None:
+        with self._lock:
+            db = self._db()
+            with db:
+                db.execute('DELETE FROM cache')
+            self._data = {}
+            self._stored_at = {}
+            self._accessed_at = {}
+            self._dirty.clear()
+            self._touched.clear()
+
+    def close(self) -> None:
+        with self._lock:
+            self.flush()
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def to_json(self) -> dict:
+        with self._lock:
+            self.flush()
+            rows = self._db().execute('SELECT url, data, etag, last_modified, link, fetched_at FROM cache').fetchall()
+        return {url: CacheItem(json.loads(data), etag, last_modified, link, fetched_at).to_json()
+                for url, data, etag, last_modified, link, fetched_at in rows}
+
+    def from_json(self, data: dict) -> None:
+        for url, item_data in data.items():
+            self.set(url, CacheItem.from_json(item_data))
+
+    def __contains__(self, url: str) -> bool:
+        return self.get(url) is not None
+
+    def __len__(self) -> int:
+        return self.size()[0]
@@ -0,0 +1,156 @@
+import json
+import sqlite3
+
+from package_manager.api_cache import FRESH
+from package_manager.api_cache import OUTDATED
+from package_manager.api_cache import STALE
+from package_manager.api_cache import APICache
+from package_manager.api_cache import CacheItem
+
+
+def test_flushes_in_batches(tmp_path):
+    file_path = str(tmp_path / 'cache.db')
+    cache = APICache(file_path, flush_every=3)
+    cache.set('a', CacheItem(1, etag='x'))
+    cache.set('b', CacheItem(2))
+    assert cache.is_dirty()
+    assert APICache(file_path).get('a') is None
+
+    cache.set('c', CacheItem(3))
+    assert not cache.is_dirty()
+    other_cache = APICache(file_path)
+    assert other_cache.get('a').etag == 'x'
+    assert other_cache.get('c').data == 3
+    assert len(other_cache) == 3
+
+
+def test_point_lookup_and_update(tmp_path):
+    file_path = str(tmp_path / 'cache.db')
+    cache = APICache(file_path)
+    cache.from_json({f'url{i}': {'data': [i]} for i in range(10)})
+    cache.close()
+
+    cache = APICache(file_path)
+    cache.set('url5', CacheItem(['new'], etag='y'))
+    cache.close()
+
+    cache = APICache(file_path)
+    assert cache.get('url5').data == ['new']
+    assert cache.get('url4').data == [4]
+    assert 'missing' not in cache
+
+
+def test_legacy_file_import(tmp_path):
+    legacy_file_path = tmp_path / 'cache'
+    legacy_file_path.write_text(json.dumps({'a': {'data': 1, 'etag': 'x'}}))
+    cache = APICache(str(tmp_path / 'cache.db'), legacy_file_path=str(legacy_file_path))
+    assert cache.get('a').etag == 'x'
+    assert not legacy_file_path.exists()
+
+
+def test_broken_legacy_file_is_ignored(tmp_path):
+    legacy_file_path = tmp_path / 'cache'
+    legacy_file_path.write_text('{')
+    cache = APICache(str(tmp_path / 'cache.db'), legacy_file_path=str(legacy_file_path))
+    assert cache.get('a') is None
+
+
+def test_lru_eviction_by_entries(tmp_path):
+    cache = APICache(str(tmp_path / 'cache.db'), flush_every=1, max_entries=3)
+    for url in ('a', 'b', 'c'):
+        cache.set(url, CacheItem(url))
+    cache.get('a')
+    cache.set('d', CacheItem('d'))
+    assert cache.size()[0] == 3
+    assert cache.get('b') is None
+    assert cache.get('a').data == 'a'
+    assert cache.stats.evicted == 1
+
+
+def test_lru_eviction_by_bytes(tmp_path):
+    cache = APICache(str(tmp_path / 'cache.db'), max_bytes=250)
+    for url in ('a', 'b', 'c'):
+        cache.set(url, CacheItem('x' * 98))  # 100 bytes as JSON
+    entries, size = cache.size()
+    assert entries == 2
+    assert size == 200
+
+
+def test_ttl_eviction(tmp_path, monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr('package_manager.api_cache.time', lambda: now)
+    cache = APICache(str(tmp_path / 'cache.db'), ttl_rules=((r'/releases\?page=', 10), (r'', 100)))
+    cache.set('/releases?page=2', CacheItem(2))
+    cache.set('/repos/a', CacheItem(1))
+    cache.flush()
+
+    now = 1050.0
+    assert cache.get('/releases?page=2') is None
+    assert cache.get('/repos/a').data == 1
+    assert cache.stats.expired == 1
+
+    now = 1200.0
+    cache.evict()
+    assert cache.size() == (0, 0)
+
+
+def test_expiration_times_of_old_databases(tmp_path, monkeypatch):
+    file_path = str(tmp_path / 'cache.db')
+    with sqlite3.connect(file_path) as connection:
+        connection.execute('CREATE TABLE cache (url TEXT PRIMARY KEY, data TEXT NOT NULL, stored_at REAL)')
+        connection.executemany('INSERT INTO cache VALUES (?, ?, ?)', (('/releases?page=2', '2', 1000.0),
+                                                                       ('/repos/a', '1', 1000.0)))
+    connection.close()
+
+    monkeypatch.setattr('package_manager.api_cache.time', lambda: 1050.0)
+    cache = APICache(file_path, ttl_rules=((r'/releases\?page=', 10), (r'', 100)))
+    cache.evict()
+    assert cache.stats.expired == 1
+    assert cache.size()[0] == 1
+    assert cache.get('/repos/a').data == 1
+
+
+def test_fetched_at_is_stored(tmp_path):
+    file_path = str(tmp_path / 'cache.db')
+    cache = APICache(file_path)
+    cache.set('a', CacheItem(1, fetched_at=1000.0))
+    cache.set('b', CacheItem(2))
+    cache.close()
+
+    cache = APICache(file_path)
+    assert cache.get('a').fetched_at == 1000.0
+    assert cache.get('b').fetched_at is None
+    assert cache.to_json()['a']['fetched_at'] == 1000.0
+
+
+def test_touch_writes_only_the_times(tmp_path, monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr('package_manager.api_cache.time', lambda: now)
+    file_path = str(tmp_path / 'cache.db')
+    cache = APICache(file_path, ttl_rules=((r'', 100),))
+    item = CacheItem([1], etag='x', fetched_at=now)
+    cache.set('a', item)
+    cache.flush()
+
+    now = 1090.0
+    item.data.append(2)  # Not written by touch()
+    cache.touch('a', item)
+    assert cache.is_dirty()
+    cache.close()
+
+    now = 1150.0  # Expired if the time to live had not been renewed
+    cache = APICache(file_path, ttl_rules=((r'', 100),))
+    cache.evict()
+    assert cache.get('a').data == [1]
+    assert cache.get('a').fetched_at == 1090.0
+
+
+def test_freshness():
+    cache = APICache(':memory:', freshness_rules=((r'/releases', 60, 3600), (r'', 300, 86400)))
+    item = CacheItem(1, fetched_at=1000.0)
+    assert cache.freshness('/releases', item, now=1059.0) == FRESH
+    assert cache.freshness('/releases', item, now=1061.0) == STALE
+    assert cache.freshness('/releases', item, now=4661.0) == OUTDATED
+    assert cache.freshness('/repos/a', item, now=1061.0) == FRESH
+    assert cache.freshness('/repos/a', CacheItem(1), now=1061.0) == OUTDATED
+    assert APICache(':memory:').freshness('/repos/a', item, now=1000.0) == OUTDATED
@@ -0,0 +1,109 @@
+import os
+import shutil
+import sqlite3
+import threading
+from time import time
+
+from package_manager.download import file_sha256
+
+
+# Downloaded archives are stored by the sha256 of their content as "objects/ab/abcdef....zip".
+# Keys (URL plus a validator like an asset update time or a release id) point to the objects,
+# so the same archive downloaded under several keys is stored once.
+# The total size is bounded by `max_bytes`, least recently used objects are evicted first.
+class ArchiveCache:
+    def __init__(self, root: str, max_bytes: int | None = None) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+
+        self._connection: sqlite3.Connection | None = None
+        self._lock = threading.RLock()
+
+    def _db(self) -> sqlite3.Connection:
+        if self._connection is None:
+            os.makedirs(os.path.join(self.root, 'objects'), exist_ok=True)
+            self._connection = sqlite3.connect(os.path.join(self.root, 'index.db'), check_same_thread=False)
+            with self._connection:
+                self._connection.execute('CREATE TABLE IF NOT EXISTS keys (key TEXT PRIMARY KEY, sha256 TEXT NOT NULL)')
+                self._connection.execute('CREATE TABLE IF NOT EXISTS objects ('
+                                         'sha256 TEXT PRIMARY KEY, size INTEGER NOT NULL, accessed_at REAL NOT NULL)')
+        return self._connection
+
+    @staticmethod
+    def make_key(url: str, validator: str | None = None) -> str:
+        return f'{url}#{validator}' if validator else url
+
+    def object_path(self, sha256: str) -> str:
+        return os.path.join(self.root, 'objects', sha256[:2], sha256 + '.zip')
+
+    def get_by_sha256(self, sha256: str) -> str | None:
+        with self._lock:
+            path = self.object_path(sha256)
+            db = self._db()
+            if not os.path.isfile(path):
+                with db:
+                    db.execute('DELETE FROM objects WHERE sha256 = ?', (sha256,))
+                return None
+            with db:
+                db.execute('UPDATE objects SET accessed_at = ? WHERE sha256 = ?', (time(), sha256))
+            return path
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            row = self._db().execute('SELECT sha256 FROM keys WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                return None
+            return self.get_by_sha256(row[0])
+
+    def put(self, key: str, file_path: str, sha256: str | None = None) -> str:
+        # Moves the file into the cache and returns its new path
+        sha256 = sha256 or file_sha256(file_path)
+        with self._lock:
+            path = self.object_path(sha256)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            if os.path.isfile(path):
+                os.remove(file_path)
+            else:
+                shutil.move(file_path, path + '.tmp')
+                os.replace(path + '.tmp', path)
+            db = self._db()
+            with db:
+                db.execute('INSERT OR REPLACE INTO objects VALUES (?, ?, ?)', (sha256, os.path.getsize(path), time()))
+                db.execute('INSERT OR REPLACE INTO keys VALUES (?, ?)', (key, sha256))
+            self.evict(keep=sha256)
+            return path
+
+    def evict(self, keep: str | None = None) -> None:
+        if self.max_bytes is None:
+            return
+        with self._lock:
+            db = self._db()
+            total = db.execute('SELECT COALESCE(SUM(size), 0) FROM objects').fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            for sha256, size in db.execute('SELECT sha256, size FROM objects ORDER BY accessed_at').fetchall():
+                if total <= self.max_bytes:
+                    break
+                if sha256 == keep:
+                    continue
+                self._remove(sha256)
+                total -= size
+
+    def _remove(self, sha256: str) -> None:
+        try:
+            os.remove(self.object_path(sha256))
+        except FileNotFoundError:
+            pass
+        db = self._db()
+        with db:
+            db.execute('DELETE FROM objects WHERE sha256 = ?', (sha256,))
+            db.execute('DELETE FROM keys WHERE sha256 = ?', (sha256,))
+
+    def size(self) -> tuple[int, int]:
+        with self._lock:
+            return self._db().execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM objects').fetchone()
+
+    def clear(self) -> None:
+        with self._lock:
+            for (sha256,) in self._db().execute('SELECT sha256 FROM objects').fetchall():
+                self._remove(sha256)
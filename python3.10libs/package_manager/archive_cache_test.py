@@ -0,0 +1,70 @@
+import hashlib
+import os
+
+from package_manager.archive_cache import ArchiveCache
+
+
+def make_file(tmp_path, name, data):
+    file_path = tmp_path / name
+    file_path.write_bytes(data)
+    return str(file_path)
+
+
+def test_put_and_get(tmp_path):
+    cache = ArchiveCache(str(tmp_path / 'archives'))
+    key = ArchiveCache.make_key('https://example.com/a.zip', '2024-01-01T00:00:00Z')
+    path = cache.put(key, make_file(tmp_path, 'a.zip', b'abc'))
+
+    sha256 = hashlib.sha256(b'abc').hexdigest()
+    assert path == cache.object_path(sha256)
+    assert not os.path.exists(tmp_path / 'a.zip')
+    assert ArchiveCache(str(tmp_path / 'archives')).get(key) == path
+    assert cache.get_by_sha256(sha256) == path
+    assert cache.get(ArchiveCache.make_key('https://example.com/a.zip', 'other')) is None
+
+
+def test_same_content_stored_once(tmp_path):
+    cache = ArchiveCache(str(tmp_path / 'archives'))
+    first_path = cache.put('a', make_file(tmp_path, 'a.zip', b'same'))
+    second_path = cache.put('b', make_file(tmp_path, 'b.zip', b'same'))
+    assert first_path == second_path
+    assert cache.size() == (1, 4)
+    assert cache.get('a') == cache.get('b') == first_path
+
+
+def test_missing_object(tmp_path):
+    cache = ArchiveCache(str(tmp_path / 'archives'))
+    path = cache.put('a', make_file(tmp_path, 'a.zip', b'abc'))
+    os.remove(path)
+    assert cache.get('a') is None
+    assert cache.size() == (0, 0)
+
+
+def test_lru_eviction(tmp_path):
+    cache = ArchiveCache(str(tmp_path / 'archives'), max_bytes=10)
+    cache.put('a', make_file(tmp_path, 'a.zip', b'a' * 4))
+    cache.put('b', make_file(tmp_path, 'b.zip', b'b' * 4))
+    assert cache.get('a') is not None  # Makes "b" the least recently used one
+    cache.put('c', make_file(tmp_path, 'c.zip', b'c' * 4))
+
+    assert cache.get('b') is None
+    assert cache.get('a') is not None
+    assert cache.get('c') is not None
+    assert cache.size() == (2, 8)
+
+
+def test_larger_than_limit_is_kept(tmp_path):
+    cache = ArchiveCache(str(tmp_path / 'archives'), max_bytes=2)
+    cache.put('a', make_file(tmp_path, 'a.zip', b'a'))
+    path = cache.put('b', make_file(tmp_path, 'b.zip', b'b' * 4))
+    assert os.path.isfile(path)
+    assert cache.get('a') is None
+
+
+def test_clear(tmp_path):
+    cache = ArchiveCache(str(tmp_path / 'archives'))
+    path = cache.put('a', make_file(tmp_path, 'a.zip', b'abc'))
+    cache.clear()
+    assert not os.path.exists(path)
+    assert cache.get('a') is None
+    assert cache.size() == (0, 0)
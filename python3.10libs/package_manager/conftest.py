@@ -0,0 +1,41 @@
+import threading
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from typing import Any
+
+import pytest
+
+
+# Serves the handler on a free local port. The handlers keep their state on the server,
+# as self.server.requests and the extra attributes, so every server starts clean.
+class LocalServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, handler: type[BaseHTTPRequestHandler], **attributes: Any) -> None:
+        super(LocalServer, self).__init__(('127.0.0.1', 0), handler)
+        self.requests = []
+        for name, value in attributes.items():
+            setattr(self, name, value)
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    @property
+    def url(self) -> str:
+        return f'http://127.0.0.1:{self.server_address[1]}'
+
+    def close(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+@pytest.fixture
+def http_server():
+    servers = []
+
+    def start(handler: type[BaseHTTPRequestHandler], **attributes: Any) -> LocalServer:
+        server = LocalServer(handler, **attributes)
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.close()
@@ -0,0 +1,139 @@
+import hashlib
+import os
+from collections.abc import Callable
+from collections.abc import Collection
+from concurrent.futures import ThreadPoolExecutor
+from timeit import default_timer
+
+
+# The compare API lists at most 300 files, a full list can't be trusted
+MAX_COMPARE_FILES = 300
+# Every changed file is a separate request
+MAX_DELTA_FILES = 150
+# Changed files are fetched uncompressed, while the archive is compressed
+MAX_DELTA_RATIO = 0.4
+
+
+class DeltaPlan:
+    __slots__ = 'downloads', 'removals', 'delta_bytes', 'full_bytes'
+
+    def __init__(self, downloads: list[tuple[str, str]], removals: list[str], delta_bytes: int, full_bytes: int):
+        self.downloads = downloads  # (path, blob sha)
+        self.removals = removals
+        self.delta_bytes = delta_bytes
+        self.full_bytes = full_bytes
+
+
+class DeltaStats:
+    __slots__ = 'downloaded_files', 'removed_files', 'downloaded_bytes', 'full_bytes', 'elapsed'
+
+    def __init__(self) -> None:
+        self.downloaded_files = 0
+        self.removed_files = 0
+        self.downloaded_bytes = 0
+        self.full_bytes = 0
+        self.elapsed = 0.0
+
+    def saved_bytes(self) -> int:
+        return max(0, self.full_bytes - self.downloaded_bytes)
+
+    def saved_time(self) -> float:
+        # Estimated from the delta throughput
+        if not self.downloaded_bytes or not self.elapsed:
+            return 0.0
+        return self.saved_bytes() / (self.downloaded_bytes / self.elapsed)
+
+
+class DeltaError(IOError):
+    pass
+
+
+def git_blob_sha(data: bytes) -> str:
+    return hashlib.sha1(b'blob %d\0' % len(data) + data, usedforsecurity=False).hexdigest()
+
+
+def is_tree_installed(tree_data: dict, dst_path: str, ignore: Collection[str] = ()) -> bool:
+    # True when every file of the tree is installed unmodified, so changes between tags can be applied on top.
+    # Packages installed from release assets or edited locally must be updated with the full archive.
+    if tree_data.get('truncated'):
+        return False
+    for entry in tree_data.get('tree', ()):
+        if entry.get('type') != 'blob' or entry['path'] in ignore:
+            continue
+        try:
+            with open(os.path.join(dst_path, entry['path']), 'rb') as file:
+                data = file.read()
+        except OSError:
+            return False
+        if git_blob_sha(data) != entry['sha']:
+            return False
+    return True
+
+
+def plan_delta(compare_data: dict, tree_data: dict) -> DeltaPlan | None:
+    # Returns None when the full archive should be downloaded instead
+    files = compare_data.get('files')
+    if files is None or len(files) >= MAX_COMPARE_FILES or tree_data.get('truncated'):
+        return None
+
+    sizes = {entry['path']: entry.get('size', 0) for entry in tree_data.get('tree', ()) if entry.get('type') == 'blob'}
+    full_bytes = sum(sizes.values())
+
+    downloads = []
+    removals = []
+    for file_data in files:
+        status = file_data.get('status')
+        path = file_data['filename']
+        if status == 'removed':
+            removals.append(path)
+            continue
+        if status == 'renamed':
+            removals.append(file_data['previous_filename'])
+        if path not in sizes:  # Submodule or symlink
+            return None
+        downloads.append((path, file_data['sha']))
+
+    delta_bytes = sum(sizes[path] for path, _ in downloads)
+    if len(downloads) > MAX_DELTA_FILES or delta_bytes > full_bytes * MAX_DELTA_RATIO:
+        return None
+    return DeltaPlan(downloads, removals, delta_bytes, full_bytes)
+
+
+def apply_delta(plan: DeltaPlan, dst_path: str, fetch: Callable[[str], bytes], max_workers: int = 8) -> DeltaStats:
+    # Applied to a staging copy of the installed version, fetch returns the new content of a path
+    start = default_timer()
+    stats = DeltaStats()
+    stats.full_bytes = plan.full_bytes
+
+    def target(path: str) -> str:
+        target_path = os.path.normpath(os.path.join(dst_path, path))
+        if not target_path.startswith(os.path.normpath(dst_path) + os.sep):
+            raise DeltaError(f'Unsafe path: {path}')
+        return target_path
+
+    def download(item: tuple[str, str]) -> int:
+        path, sha = item
+        data = fetch(path)
+        if git_blob_sha(data) != sha:
+            raise DeltaError(f'Checksum mismatch: {path}')
+        target_path = target(path)
+        os.makedirs(os.path.dirname(target_path), exist_ok=True)
+        if os.path.lexists(target_path):
+            os.remove(target_path)  # Never write through, it may be a hard link to the installed version
+        with open(target_path, 'wb') as file:
+            file.write(data)
+        return len(data)
+
+    for path in plan.removals:
+        target_path = target(path)
+        if os.path.lexists(target_path):
+            os.remove(target_path)
+            stats.removed_files += 1
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='package_manager') as executor:
+        for size in executor.map(download, plan.downloads):
+            stats.downloaded_files += 1
+            stats.downloaded_bytes += size
+
+    stats.elapsed = default_timer() - start
+    return stats
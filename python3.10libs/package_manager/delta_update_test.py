@@ -0,0 +1,72 @@
+from package_manager.delta_update import apply_delta
+from package_manager.delta_update import git_blob_sha
+from package_manager.delta_update import is_tree_installed
+from package_manager.delta_update import plan_delta
+
+
+NEW_CONTENT = {
+    'scripts/a.py': b'print("new")\n',
+    'scripts/moved.py': b'moved\n',
+    'otls/big.hda': b'x' * 10000,
+}
+
+
+def tree():
+    return {'tree': [{'path': path, 'type': 'blob', 'size': len(data)} for path, data in NEW_CONTENT.items()]}
+
+
+def test_git_blob_sha():
+    assert git_blob_sha(b'') == 'e69de29bb2d1d6434b8b29ae775ad8c2e48c5391'
+
+
+def test_plan_and_apply(tmp_path):
+    (tmp_path / 'scripts').mkdir()
+    (tmp_path / 'scripts' / 'a.py').write_text('print("old")\n')
+    (tmp_path / 'scripts' / 'old.py').write_text('moved\n')
+    (tmp_path / 'removed.txt').write_text('')
+    compare = {'files': [
+        {'filename': 'scripts/a.py', 'status': 'modified', 'sha': git_blob_sha(NEW_CONTENT['scripts/a.py'])},
+        {'filename': 'scripts/moved.py', 'previous_filename': 'scripts/old.py', 'status': 'renamed',
+         'sha': git_blob_sha(NEW_CONTENT['scripts/moved.py'])},
+        {'filename': 'removed.txt', 'status': 'removed', 'sha': git_blob_sha(b'')},
+    ]}
+
+    plan = plan_delta(compare, tree())
+    assert plan is not None
+    assert plan.removals == ['scripts/old.py', 'removed.txt']
+
+    stats = apply_delta(plan, str(tmp_path), NEW_CONTENT.__getitem__)
+    assert (tmp_path / 'scripts' / 'a.py').read_bytes() == NEW_CONTENT['scripts/a.py']
+    assert (tmp_path / 'scripts' / 'moved.py').exists()
+    assert not (tmp_path / 'scripts' / 'old.py').exists()
+    assert not (tmp_path / 'removed.txt').exists()
+    assert stats.downloaded_files == 2
+    assert stats.saved_bytes() == 10000
+
+
+def test_large_delta_falls_back():
+    compare = {'files': [
+        {'filename': 'otls/big.hda', 'status': 'modified', 'sha': git_blob_sha(NEW_CONTENT['otls/big.hda'])},
+    ]}
+    assert plan_delta(compare, tree()) is None
+    assert plan_delta({'files': []}, {'tree': [], 'truncated': True}) is None
+
+
+def test_installed_tree_check(tmp_path):
+    (tmp_path / 'scripts').mkdir()
+    (tmp_path / 'scripts' / 'a.py').write_bytes(NEW_CONTENT['scripts/a.py'])
+    (tmp_path / 'package.setup').write_text('{"version": "local"}')
+    tree_data = {'tree': [
+        {'path': 'scripts', 'type': 'tree', 'sha': '0' * 40},
+        {'path': 'scripts/a.py', 'type': 'blob', 'sha': git_blob_sha(NEW_CONTENT['scripts/a.py'])},
+        {'path': 'package.setup', 'type': 'blob', 'sha': git_blob_sha(b'{}')},
+    ]}
+    assert is_tree_installed(tree_data, str(tmp_path), ignore=('package.setup',))
+    assert not is_tree_installed(tree_data, str(tmp_path))  # Merged package.setup differs
+
+    (tmp_path / 'scripts' / 'a.py').write_text('edited locally')
+    assert not is_tree_installed(tree_data, str(tmp_path), ignore=('package.setup',))
+
+    (tmp_path / 'scripts' / 'a.py').unlink()
+    assert not is_tree_installed(tree_data, str(tmp_path), ignore=('package.setup',))
+    assert not is_tree_installed({'tree': [], 'truncated': True}, str(tmp_path))
@@ -0,0 +1,140 @@
+import hashlib
+import os
+from collections.abc import Callable
+from collections.abc import Mapping
+
+from package_manager import network
+
+
+CHUNK_SIZE = 256 * 1024
+
+# Called with downloaded and total bytes (None if unknown), returns False to cancel
+Progress = Callable[[int, int | None], bool]
+
+
+class DownloadError(IOError):
+    pass
+
+
+class DownloadCancelledError(DownloadError):
+    pass
+
+
+def parse_digest(digest: str | None) -> str | None:
+    # GitHub reports asset digests as "sha256:<hex>"
+    if digest and digest.startswith('sha256:'):
+        return digest[7:].lower()
+    return None
+
+
+def download(
+        url: str,
+        file_path: str,
+        expected_size: int | None = None,
+        sha256: str | None = None,
+        progress: Progress | None = None,
+        chunk_size: int = CHUNK_SIZE,
+) -> str:
+    # Data is streamed to "<file_path>.part" chunk by chunk. If a partial file is left from
+    # a previous attempt, the transfer is resumed with an HTTP Range request. The resume is
+    # conditional on the validator of the first response, so a part of a file that has changed
+    # since, like a branch archive, is never completed with the new content.
+    # The part file is moved to file_path only after its size and checksum are verified.
+    part_path = file_path + '.part'
+    validator_path = part_path + '.validator'
+    offset = os.path.getsize(part_path) if os.path.isfile(part_path) else 0
+    validator = read_validator(validator_path) if offset else None
+    if not validator or (expected_size is not None and offset > expected_size):
+        offset = 0
+
+    total = expected_size
+    headers = {'Range': f'bytes={offset}-', 'If-Range': validator} if offset else {}
+    with network.get(url, headers=headers, stream=True) as response:
+        if offset and response.status_code == 416:
+            # The part file is not shorter than the unchanged remote file, the size check decides
+            if total is None:
+                total = content_range_total(response.headers.get('Content-Range'))
+            if total is None:
+                remove_part(part_path)
+                return download(url, file_path, expected_size, sha256, progress, chunk_size)
+        else:
+            if offset and response.status_code != 206:  # Changed remote file or Range is not supported, start over
+                offset = 0
+            if response.status_code not in (200, 206):
+                raise DownloadError(f'Download failed with status {response.status_code}: {url}')
+
+            content_length = response.headers.get('Content-Length')
+            if total is None and content_length:
+                total = offset + int(content_length)
+
+            if not offset:
+                write_validator(validator_path, response_validator(response.headers))
+
+            done = offset
+            with open(part_path, 'ab' if offset else 'wb') as file:
+                for chunk in response.iter_content(chunk_size):
+                    file.write(chunk)
+                    done += len(chunk)
+                    if progress is not None and not progress(done, total):
+                        raise DownloadCancelledError(url)
+
+    size = os.path.getsize(part_path)
+    if total is not None and size != total:
+        if size > total:
+            remove_part(part_path)
+        raise DownloadError(f'Downloaded {size} of {total} bytes: {url}')
+
+    if sha256 and file_sha256(part_path) != sha256.lower():
+        remove_part(part_path)
+        raise DownloadError(f'Checksum mismatch: {url}')
+
+    os.replace(part_path, file_path)
+    remove_part(part_path)
+    return file_path
+
+
+def response_validator(headers: Mapping[str, str]) -> str | None:
+    # Weak ETags can't be used in If-Range
+    etag = headers.get('ETag')
+    if etag and not etag.startswith('W/'):
+        return etag
+    return headers.get('Last-Modified')
+
+
+def read_validator(validator_path: str) -> str | None:
+    try:
+        with open(validator_path) as file:
+            return file.read().strip() or None
+    except OSError:
+        return None
+
+
+def write_validator(validator_path: str, validator: str | None) -> None:
+    if validator is None:
+        if os.path.isfile(validator_path):
+            os.remove(validator_path)
+        return
+    with open(validator_path, 'w') as file:
+        file.write(validator)
+
+
+def content_range_total(content_range: str | None) -> int | None:
+    # "bytes */<total>" or "bytes <first>-<last>/<total>"
+    if not content_range or '/' not in content_range:
+        return None
+    total = content_range.rpartition('/')[2].strip()
+    return int(total) if total.isdigit() else None
+
+
+def remove_part(part_path: str) -> None:
+    for path in (part_path, part_path + '.validator'):
+        if os.path.isfile(path):
+            os.remove(path)
+
+
+def file_sha256(file_path: str, chunk_size: int = CHUNK_SIZE) -> str:
+    file_hash = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        while chunk := file.read(chunk_size):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
@@ -0,0 +1,112 @@
+import hashlib
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+from package_manager.download import DownloadCancelledError
+from package_manager.download import DownloadError
+from package_manager.download import download
+
+
+CONTENT = bytes(range(256)) * 4096  # 1 MB
+
+
+class RangeHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self) -> None:
+        content = self.server.content
+        etag = '"' + hashlib.sha1(content, usedforsecurity=False).hexdigest() + '"'
+        range_header = self.headers.get('Range')
+        if self.headers.get('If-Range', etag) != etag:  # Changed since the part was downloaded
+            range_header = None
+        self.server.requests.append(range_header)
+        start = int(range_header[6:-1]) if range_header else 0
+        if start >= len(content):
+            self.send_response(416)
+            self.send_header('Content-Range', f'bytes */{len(content)}')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        body = content[start:]
+        self.send_response(206 if range_header else 200)
+        self.send_header('ETag', etag)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def server(http_server):
+    return http_server(RangeHandler, content=CONTENT)
+
+
+@pytest.fixture
+def url(server):
+    return f'{server.url}/asset.zip'
+
+
+def test_download_with_progress_and_checksum(tmp_path, url):
+    progress = []
+    file_path = str(tmp_path / 'asset.zip')
+    download(url, file_path, sha256=hashlib.sha256(CONTENT).hexdigest(),
+             progress=lambda done, total: progress.append((done, total)) or True)
+    assert (tmp_path / 'asset.zip').read_bytes() == CONTENT
+    assert progress[-1] == (len(CONTENT), len(CONTENT))
+    assert len(progress) > 1
+
+
+def test_resume(tmp_path, server, url):
+    file_path = str(tmp_path / 'asset.zip')
+    with pytest.raises(DownloadCancelledError):
+        download(url, file_path, progress=lambda done, total: done < 300000)
+    assert (tmp_path / 'asset.zip.part').exists()
+
+    server.requests.clear()
+    download(url, file_path, expected_size=len(CONTENT))
+    assert server.requests[0].startswith('bytes=')
+    assert (tmp_path / 'asset.zip').read_bytes() == CONTENT
+    assert not (tmp_path / 'asset.zip.part').exists()
+
+
+def test_complete_part_file(tmp_path, server, url):
+    file_path = str(tmp_path / 'asset.zip')
+    with pytest.raises(DownloadCancelledError):
+        download(url, file_path, progress=lambda done, total: done < len(CONTENT))
+    assert (tmp_path / 'asset.zip.part').read_bytes() == CONTENT
+
+    server.requests.clear()
+    download(url, file_path)
+    assert server.requests == [f'bytes={len(CONTENT)}-']  # Answered with 416, the size comes from Content-Range
+    assert (tmp_path / 'asset.zip').read_bytes() == CONTENT
+    assert not (tmp_path / 'asset.zip.part.validator').exists()
+
+
+def test_changed_file_starts_over(tmp_path, server, url):
+    file_path = str(tmp_path / 'asset.zip')
+    with pytest.raises(DownloadCancelledError):
+        download(url, file_path, progress=lambda done, total: done < 300000)
+
+    # A branch archive under the same URL moves on
+    server.content = CONTENT[::-1]
+    server.requests.clear()
+    download(url, file_path)
+    assert server.requests == [None]
+    assert (tmp_path / 'asset.zip').read_bytes() == CONTENT[::-1]
+
+
+def test_part_file_without_validator(tmp_path, server, url):
+    (tmp_path / 'asset.zip.part').write_bytes(CONTENT[:1000])
+    download(url, str(tmp_path / 'asset.zip'))
+    assert server.requests == [None]
+    assert (tmp_path / 'asset.zip').read_bytes() == CONTENT
+
+
+def test_checksum_mismatch(tmp_path, url):
+    with pytest.raises(DownloadError):
+        download(url, str(tmp_path / 'asset.zip'), sha256='0' * 64)
+    assert not (tmp_path / 'asset.zip').exists()
+    assert not (tmp_path / 'asset.zip.part').exists()
@@ -1,133 +1,321 @@
+import atexit
 import datetime
+import hashlib
 import json
+import logging
 import os
 import shutil
-import zipfile
+import threading
 from collections.abc import Iterable
-from typing import Any
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from functools import partial
+from time import time
+from urllib.parse import quote
 
 import hou
-import requests
 from PySide2.QtCore import Qt
 from PySide2.QtWidgets import QComboBox
 from PySide2.QtWidgets import QDialog
 from PySide2.QtWidgets import QFormLayout
 from PySide2.QtWidgets import QHBoxLayout
+from PySide2.QtWidgets import QProgressDialog
 from PySide2.QtWidgets import QPushButton
 from PySide2.QtWidgets import QVBoxLayout
 
+from package_manager import network
+from package_manager.api_cache import FRESH
+from package_manager.api_cache import STALE
+from package_manager.api_cache import APICache
+from package_manager.api_cache import CacheItem
+from package_manager.api_cache import CacheStats
+from package_manager.archive_cache import ArchiveCache
+from package_manager.delta_update import DeltaError
+from package_manager.delta_update import DeltaStats
+from package_manager.delta_update import apply_delta
+from package_manager.delta_update import is_tree_installed
+from package_manager.delta_update import plan_delta
+from package_manager.download import DownloadCancelledError
+from package_manager.download import download
+from package_manager.download import parse_digest
+from package_manager.github_graphql import GRAPHQL_URL
+from package_manager.github_graphql import GraphQLError
+from package_manager.github_graphql import RepoMetadata
+from package_manager.github_graphql import fetch_metadata
+from package_manager.github_graphql import repo_key
 from package_manager.houdini_license import HOUDINI_COMMERCIAL_LICENSE
 from package_manager.houdini_license import full_houdini_license_name
 from package_manager.local_package import LocalPackage
 from package_manager.package import Package
 from package_manager.package import is_package
+from package_manager.pagination import iter_pages
+from package_manager.pagination import parse_link_header
+from package_manager.rate_limit import BACKGROUND
+from package_manager.rate_limit import INTERACTIVE
+from package_manager.rate_limit import QuotaExhaustedError
+from package_manager.rate_limit import RateLimiter
+from package_manager.rate_limit import current_priority
+from package_manager.rate_limit import priority
+from package_manager.single_flight import SingleFlight
+from package_manager.staging import prepare_staging
+from package_manager.staging import swap_in
+from package_manager.update_options import UpdateOptions
 from package_manager.version import Version
 from package_manager.web_package import WebPackage
+from package_manager.zip_extract import extract_zip
+
+
+logger = logging.getLogger(__name__)
 
 
 class RepoNotFoundError(IOError):
     pass
 
 
-class ReachedAPILimitError(Exception):
+class ReachedAPILimitError(QuotaExhaustedError):
     pass
 
 
-class CacheItem:
-    __slots__ = 'data', 'etag', 'last_modified'
+class ForbiddenError(IOError):
+    pass
 
-    def __init__(self, data: Any, etag: str | None = None, last_modified: float | None = None):
-        self.data = data
-        self.etag = etag
-        self.last_modified = last_modified
 
-    def to_json(self) -> dict:
-        return {
-            'data': self.data,
-            'etag': self.etag,
-            'last_modified': self.last_modified,
-        }
+class API:
+    # First matching pattern wins
+    CACHE_TTL = (
+        (r'/releases\?', timedelta(days=7).total_seconds()),
+        (r'', timedelta(days=30).total_seconds()),
+    )
+    # (pattern, fresh, stale), first matching pattern wins.
+    # Responses younger than "fresh" are used without a request. Up to "stale" later they are
+    # returned at once to the UI and revalidated in the background.
+    CACHE_FRESHNESS = (
+        (r'/releases', 60, timedelta(hours=1).total_seconds()),
+        (r'/users/', timedelta(days=1).total_seconds(), timedelta(days=7).total_seconds()),
+        (r'', 300, timedelta(days=1).total_seconds()),
+    )
+
+    _cache: APICache | None = None
+    _cache_lock = threading.Lock()
+    _flush_scheduled = False
+
+    # Quotas of the REST and GraphQL APIs are separate
+    rate_limit = RateLimiter()
+    graphql_rate_limit = RateLimiter()
+
+    _in_flight = SingleFlight()
+
+    _revalidation_executor: ThreadPoolExecutor | None = None
+    _revalidation_lock = threading.Lock()
+    _revalidating = set()
 
-    @classmethod
-    def from_json(cls, data: dict) -> 'CacheItem':
-        return cls(data['data'], data.get('etag'), data.get('last_modified'))
+    @staticmethod
+    def cache() -> APICache:
+        with API._cache_lock:
+            if API._cache is not None:
+                return API._cache
+            options = UpdateOptions()
+            API._cache = APICache(
+                hou.expandString('$HOUDINI_USER_PREF_DIR/package_manager.github_api_cache.db'),
+                legacy_file_path=hou.expandString('$HOUDINI_USER_PREF_DIR/package_manager.github_api_cache'),
+                max_entries=options.api_cache_max_entries(),
+                max_bytes=options.api_cache_max_size() * 1024 * 1024,
+                ttl_rules=API.CACHE_TTL,
+                freshness_rules=API.CACHE_FRESHNESS,
+            )
+            atexit.register(API._cache.close)
+            return API._cache
 
+    @staticmethod
+    def set_cache_limits(max_entries: int, max_bytes: int) -> None:
+        cache = API.cache()
+        cache.max_entries = max_entries
+        cache.max_bytes = max_bytes
+        cache.evict()
 
-class API:
-    cache_data: dict[str, CacheItem] = {}
+    @staticmethod
+    def get(url: str, headers: dict | None = None, timeout: int | float | None = None) -> dict:
+        item = API.get_item(url, headers, timeout)
+        return item.data if item is not None else None
+
+    @staticmethod
+    def get_page(url: str) -> tuple[list, dict[str, str]]:
+        item = API.get_item(url)
+        if item is None:
+            return [], {}
+        return item.data, parse_link_header(item.link)
 
     @staticmethod
-    def get(url: str, headers: dict | None = None, timeout: int | float = 5) -> dict:
-        headers_data = {
-            'User-Agent': 'Houdini-Package-Manager',
+    def headers() -> dict:
+        return {
             'Accept': 'application / vnd.github.v3 + json',
             'Authorization': ('token '
                               '55993b807df3eb5541c6'
                               'bcd439d69aa335fcda89'),
         }
-        if headers:
-            headers_data.update(headers)
 
+    @staticmethod
+    def get_item(url: str, headers: dict | None = None, timeout: int | float | None = None) -> CacheItem | None:
+        cache = API.cache()
+        cached_item = cache.get(url)
+        if cached_item is not None and not headers:
+            freshness = cache.freshness(url, cached_item)
+            if freshness == FRESH:
+                return cached_item
+            # Background work, like update checks, waits for the current data instead
+            if freshness == STALE and current_priority() == INTERACTIVE:
+                API.revalidate_in_background(url)
+                return cached_item
+        return API.fetch_item(url, cached_item, headers, timeout)
+
+    @staticmethod
+    def revalidate_in_background(url: str) -> None:
+        with API._revalidation_lock:
+            if url in API._revalidating:
+                return
+            API._revalidating.add(url)
+            if API._revalidation_executor is None:
+                API._revalidation_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='package_manager')
+            API._revalidation_executor.submit(API._revalidate, url)
+
+    @staticmethod
+    def _revalidate(url: str) -> None:
         try:
-            API.load_from_file()
-        except OSError:
+            with priority(BACKGROUND):
+                API.fetch_item(url, API.cache().get(url))
+        except (OSError, ReachedAPILimitError):  # Stale data stays in the cache, the next request tries again
             pass
+        except Exception:
+            logger.exception('Revalidation of %s failed', url)
+        finally:
+            with API._revalidation_lock:
+                API._revalidating.discard(url)
+
+    @staticmethod
+    def fetch_item(
+            url: str,
+            cached_item: CacheItem | None = None,
+            headers: dict | None = None,
+            timeout: int | float | None = None,
+    ) -> CacheItem | None:
+        # Concurrent requests of the same URL, like a detail view and an update check, share one round trip
+        key = (url, tuple(sorted(headers.items()))) if headers else url
+        return API._in_flight.do(key, partial(API._fetch_item, url, cached_item, headers, timeout))
+
+    @staticmethod
+    def _fetch_item(
+            url: str,
+            cached_item: CacheItem | None,
+            headers: dict | None,
+            timeout: int | float | None,
+    ) -> CacheItem | None:
+        headers_data = API.headers()
+        if headers:
+            headers_data.update(headers)
 
-        if url in API.cache_data:
-            cached_item = API.cache_data[url]
+        cache = API.cache()
+        if cached_item is not None:
             if cached_item.etag:
                 headers_data['If-None-Match'] = cached_item.etag
             elif cached_item.last_modified:
                 headers_data['If-Modified-Since'] = cached_item.last_modified
 
-        response = requests.get(url, stream=True, headers=headers_data, timeout=timeout)
+        # Cached data, even outdated, is better than nothing when the quota is exhausted
+        if not API.rate_limit.acquire(current_priority()):
+            if cached_item is not None:
+                return cached_item
+            raise ReachedAPILimitError(API.rate_limit.reset_at)
 
-        if os.getenv('username') == 'MarkWilson':  # Debug only
-            print(response.headers.get('X-RateLimit-Remaining'))
+        response = network.get(url, headers=headers_data, timeout=timeout)
+        API.rate_limit.update(response.headers, response.status_code)
 
         if response.status_code == 200:
             data = json.loads(response.text)
             etag = response.headers.get('ETag')
             last_modified = response.headers.get('Last-Modified')
-            API.cache_data[url] = CacheItem(data, etag, last_modified)
-            API.save_to_file()
-            return data
+            item = CacheItem(data, etag, last_modified, response.headers.get('Link'), time())
+            cache.set(url, item)
+            API.schedule_flush()
+            return item
         elif response.status_code == 304:
-            return API.cache_data[url].data
-        elif response.status_code == 403:
-            raise ReachedAPILimitError
+            cache.touch(url, cached_item)
+            API.schedule_flush()
+            return cached_item
+        elif response.status_code in (403, 429) and not API.rate_limit.allows():
+            if cached_item is not None:
+                return cached_item
+            raise ReachedAPILimitError(API.rate_limit.reset_at)
+        elif response.status_code == 403:  # Private or blocked repository, checking again later won't help
+            raise ForbiddenError(url)
         elif response.status_code == 404:
             raise RepoNotFoundError(url)  # TODO: explainable message
 
+    @staticmethod
+    def post_graphql(payload: dict) -> dict:
+        if not API.graphql_rate_limit.acquire(current_priority()):
+            raise GraphQLError('GraphQL rate limit exceeded')
+        response = network.post(GRAPHQL_URL, json=payload, headers=API.headers())
+        API.graphql_rate_limit.update(response.headers, response.status_code)
+        if response.status_code != 200:
+            raise GraphQLError(f'GraphQL request failed with status {response.status_code}')
+        return response.json()
+
+    @staticmethod
+    def schedule_flush() -> None:
+        if not hou.isUIAvailable() or not API.cache().is_dirty():
+            return
+        with API._cache_lock:
+            if API._flush_scheduled:
+                return
+            API._flush_scheduled = True
+        # Event loop callbacks may only be registered from the main thread
+        if threading.current_thread() is threading.main_thread():
+            hou.ui.addEventLoopCallback(API._flush_on_idle)
+        else:
+            import hdefereval  # Available only with the UI
+
+            hdefereval.executeDeferred(hou.ui.addEventLoopCallback, API._flush_on_idle)
+
+    @staticmethod
+    def _flush_on_idle() -> None:
+        hou.ui.removeEventLoopCallback(API._flush_on_idle)
+        with API._cache_lock:
+            API._flush_scheduled = False
+        API.flush()
+
+    @staticmethod
+    def flush() -> None:
+        if API._cache is not None:
+            API._cache.flush()
+
     @staticmethod
     def to_json() -> dict:
-        return {url: item.to_json() for url, item in API.cache_data.items()}
+        return API.cache().to_json()
 
     @staticmethod
     def from_json(data: dict) -> None:
-        for url, item_data in data.items():
-            API.cache_data[url] = CacheItem.from_json(item_data)
+        API.cache().from_json(data)
 
     @staticmethod
     def save_to_file() -> None:
-        file_path = hou.expandString('$HOUDINI_USER_PREF_DIR/package_manager.github_api_cache')
-        with open(file_path, 'w') as file:
-            json.dump(API.to_json(), file)
+        API.flush()
 
     @staticmethod
     def load_from_file() -> None:
-        file_path = hou.expandString('$HOUDINI_USER_PREF_DIR/package_manager.github_api_cache')
-        with open(file_path) as file:
-            API.from_json(json.load(file))
+        API.cache()
 
     @staticmethod
     def clear() -> None:
-        API.cache_data = {}
-        API.save_to_file()
+        API.cache().clear()
 
     @staticmethod
-    def cache_size() -> None:
-        raise NotImplementedError
+    def cache_size() -> tuple[int, int]:
+        return API.cache().size()
+
+    @staticmethod
+    def cache_stats() -> CacheStats:
+        return API.cache().stats
 
 
 def owner_and_repo_name(source: str) -> list[str]:
@@ -138,6 +326,10 @@ def repo_url(owner: str, repo_name: str) -> str:
     return f'https://github.com/{owner}/{repo_name}'
 
 
+def iter_releases(repo_api_url: str, max_releases: int | None = None) -> Iterator[dict]:
+    return iter_pages(API.get_page, repo_api_url + '/releases', per_page=100, max_items=max_releases)
+
+
 def is_package_repo(source: str) -> bool:
     repo_owner, repo_name = owner_and_repo_name(source)
     api_repo_url = f'https://api.github.com/repos/{repo_owner}/{repo_name}/contents'
@@ -158,19 +350,55 @@ def extract_repo_zip(
         dst_name = dst_name.replace('/', '__')
     dst_location = str(os.path.join(hou.expandString(dst_location),
                                     hou.expandString(dst_name)))
-    if os.path.exists(dst_location):
-        shutil.rmtree(dst_location)
-    with zipfile.ZipFile(file_path) as file:
-        repo_root_path = file.namelist()[0]
-        for zip_data in file.infolist():
-            if zip_data.filename[-1] == '/':
-                continue
-            zip_data.filename = zip_data.filename.replace(repo_root_path, '')
-            file.extract(zip_data, dst_location)
+    # Extracted next to the installed version and swapped in with a rename,
+    # so the package is never left half-updated
+    staging = prepare_staging(dst_location, copy=('package.setup',))
+    try:
+        # Files not changed since the installed version are not rewritten, package.setup is kept for merging
+        extract_zip(file_path, staging, keep=('package.setup',))
+        swap_in(staging, dst_location)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)  # Still there only if the update failed
     return dst_location
 
 
+REPO_METADATA_MAX_AGE = 300  # Seconds
+
+# Filled by prefetch_repo_metadata(), repositories missing here are requested from the REST API
+_repo_metadata: dict[tuple[str, str], tuple[float, RepoMetadata]] = {}
+_owner_names: dict[str, str] = {}
+
+
+def prefetch_repo_metadata(links: Iterable[str]) -> int:
+    # One GraphQL request per batch of repositories instead of up to three REST requests per repository.
+    # Failures are ignored, the REST API is still there.
+    repos = [owner_and_repo_name(link) for link in links]
+    if not repos:
+        return 0
+    try:
+        results = fetch_metadata(repos, API.post_graphql)
+    except (GraphQLError, OSError, ValueError):
+        return 0
+    now = time()
+    for key, metadata in results.items():
+        if metadata is None:
+            continue
+        _repo_metadata[key] = now, metadata
+        if metadata.owner_name:
+            _owner_names[metadata.owner_login] = metadata.owner_name
+    return len(_repo_metadata)
+
+
+def repo_metadata(repo_owner: str, repo_name: str) -> RepoMetadata | None:
+    fetched_at, metadata = _repo_metadata.get(repo_key(repo_owner, repo_name), (0, None))
+    if time() - fetched_at > REPO_METADATA_MAX_AGE:
+        return None
+    return metadata
+
+
 def owner_name(login: str) -> str:
+    if login in _owner_names:
+        return _owner_names[login]
     return API.get('https://api.github.com/users/' + login).get('name', login)
 
 
@@ -179,9 +407,55 @@ def repo_description(package_or_link: str | Package) -> str:
         repo_owner, repo_name = owner_and_repo_name(package_or_link.source)
     else:  # package_or_link is link
         repo_owner, repo_name = owner_and_repo_name(package_or_link)
+    metadata = repo_metadata(repo_owner, repo_name)
+    if metadata is not None:
+        return metadata.description
     return API.get(f'https://api.github.com/repos/{repo_owner}/{repo_name}').get('description')
 
 
+def delta_update(repo_api_url: str, package: Package, new_tag: str) -> DeltaStats | None:
+    # Fetches only the files changed between the installed and the new tag.
+    # Returns None when the full archive should be used instead.
+    repo_owner, repo_name = owner_and_repo_name(package.source)
+    old_tag = package.version
+    try:
+        old_tree_data = API.get(f'{repo_api_url}/git/trees/{quote(old_tag)}?recursive=1')
+        if not old_tree_data or not is_tree_installed(old_tree_data, package.content_path, ignore=('package.setup',)):
+            return None
+        compare_data = API.get(f'{repo_api_url}/compare/{quote(old_tag)}...{quote(new_tag)}')
+        tree_data = API.get(f'{repo_api_url}/git/trees/{quote(new_tag)}?recursive=1')
+    except (OSError, ReachedAPILimitError):
+        return None
+    if not compare_data or not tree_data:
+        return None
+
+    plan = plan_delta(compare_data, tree_data)
+    if plan is None:
+        return None
+
+    def fetch(path: str) -> bytes:
+        response = network.get(f'https://raw.githubusercontent.com/{repo_owner}/{repo_name}/{quote(new_tag)}/'
+                               + quote(path))
+        if response.status_code != 200:
+            raise DeltaError(f'Failed to fetch {path}')
+        return response.content
+
+    staging = prepare_staging(package.content_path, copy=('package.setup',))
+    try:
+        stats = apply_delta(plan, staging, fetch)
+        swap_in(staging, package.content_path)
+    except OSError:
+        return None
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)  # Still there only if the update failed
+    return stats
+
+
+# How the package was installed, stored in package.setup
+SOURCE_ARCHIVE_ZIPBALL = 'zipball'
+SOURCE_ARCHIVE_ASSET = 'asset'
+
+
 def update_package_data_file(
         repo_data: str,
         package: WebPackage | None,
@@ -189,6 +463,7 @@ def update_package_data_file(
         version: str,
         version_type: str,
         update: bool = False,
+        source_archive: str | None = None,
 ) -> None:
     data_file_path = os.path.join(package_location, 'package.setup')
     try:
@@ -221,16 +496,71 @@ def update_package_data_file(
         data['status'] = package.status or data.get('status') or 'Stable'
     if not data.get('setup_schema') or update:
         data['setup_schema'] = package.setup_schema or data.get('setup_schema')
+    if source_archive:
+        data['source_archive'] = source_archive
     with open(data_file_path, 'w') as file:
         json.dump(data, file, indent=4)
 
 
-def download_file(url: str, dst_location: str = '$TEMP') -> str:
-    zip_file_path = os.path.join(hou.expandString(dst_location), os.path.basename(url) + '.zip')
-    with open(zip_file_path, 'wb') as file:
-        response = requests.get(url, timeout=5)
-        file.write(response.content)  # TODO: sequentially
-    return zip_file_path
+_archive_cache: ArchiveCache | None = None
+_archive_cache_lock = threading.Lock()
+
+
+def archive_cache() -> ArchiveCache:
+    # Shared by all Houdini versions, next to the version specific preference folders
+    global _archive_cache
+    with _archive_cache_lock:
+        if _archive_cache is None:
+            pref_dir = os.path.normpath(hou.expandString('$HOUDINI_USER_PREF_DIR'))
+            _archive_cache = ArchiveCache(
+                os.path.join(os.path.dirname(pref_dir), 'houdini_package_manager', 'archives'),
+                max_bytes=UpdateOptions().archive_cache_max_size() * 1024 * 1024,
+            )
+        return _archive_cache
+
+
+def download_file(
+        url: str,
+        dst_location: str = '$TEMP',
+        size: int | None = None,
+        digest: str | None = None,
+        validator: str | None = None,
+) -> str:
+    # Returns the path of the archive in the archive cache, the file must not be removed by the caller.
+    # The validator (asset update time, release id, ...) tells apart different content under the same URL.
+    cache = archive_cache()
+    sha256 = parse_digest(digest)
+    key = ArchiveCache.make_key(url, validator)
+    cached_path = cache.get_by_sha256(sha256) if sha256 else None
+    if cached_path is None:
+        cached_path = cache.get(key)
+    if cached_path is not None:
+        return cached_path
+
+    # Part files of different content under the same URL are kept apart when the validator is known
+    url_hash = hashlib.sha1(key.encode(), usedforsecurity=False).hexdigest()[:8]
+    zip_file_path = os.path.join(hou.expandString(dst_location), f'{os.path.basename(url)}-{url_hash}.zip')
+
+    if not hou.isUIAvailable():
+        download(url, zip_file_path, size, sha256)
+        return cache.put(key, zip_file_path, sha256)
+
+    dialog = QProgressDialog(f'Downloading {os.path.basename(url)}', 'Cancel', 0, 0, hou.qt.mainWindow())
+    dialog.setWindowTitle('Package Manager: Download')
+    dialog.setWindowModality(Qt.WindowModal)
+    dialog.setMinimumDuration(500)
+
+    def progress(done: int, total: int | None) -> bool:
+        if total:
+            dialog.setMaximum(total // 1024)  # Kilobytes, QProgressDialog is limited to int
+        dialog.setValue(done // 1024)
+        return not dialog.wasCanceled()
+
+    try:
+        download(url, zip_file_path, size, sha256, progress)
+    finally:
+        dialog.close()
+    return cache.put(key, zip_file_path, sha256)
 
 
 class PickReleaseDialog(QDialog):
@@ -351,13 +681,8 @@ def install_from_repo(
     repo_api_url = f'https://api.github.com/repos/{repo_owner}/{repo_name}'
     repo_data = API.get(repo_api_url)
 
-    releases_api_url = repo_api_url + '/releases'
-    releases = []
-    for i in range(1, 4):  # Latest 90 releases (30 per page)
-        releases.extend(API.get(releases_api_url + '?page=' + str(i)))
-
     suitable_releases = []
-    for release_data in releases:
+    for release_data in iter_releases(repo_api_url, max_releases=90):
         if only_stable and release_data['prerelease'] or release_data.get('draft'):
             continue  # TODO: Check release type by version
         suitable_releases.append(release_data)
@@ -377,6 +702,9 @@ def install_from_repo(
                 return False  # Cancelled
         version_type = 'version'
         version = release_data['tag_name']
+        asset_size = asset_digest = None
+        source_archive = SOURCE_ARCHIVE_ZIPBALL
+        asset_validator = str(release_data.get('id') or release_data.get('published_at') or '')
 
         if release_data['assets']:
             if len(release_data['assets']) == 1:
@@ -390,25 +718,51 @@ def install_from_repo(
                 return False  # Cancelled
             else:
                 asset_url = asset_data['browser_download_url']
+                source_archive = SOURCE_ARCHIVE_ASSET
+                asset_size = asset_data.get('size')
+                asset_digest = asset_data.get('digest')
+                asset_validator = asset_data.get('updated_at')
         else:
             asset_url = release_data['zipball_url']
     else:
         version_type = 'time_github'
         version = repo_data['pushed_at']
+        asset_size = asset_digest = None
+        source_archive = SOURCE_ARCHIVE_ZIPBALL
+        asset_validator = repo_data['pushed_at']
         repo_owner = repo_data['owner']['login']
         repo_name = repo_data['name']
         branch = repo_data.get('default_branch', 'master')
         asset_url = f'https://github.com/{repo_owner}/{repo_name}/zipball/{branch}'
 
-    zip_file = download_file(asset_url)
+    # Only packages installed from the repository archive of a tag can be updated with the changes between tags,
+    # release assets may be built from anything
+    if update and version_type == 'version' and source_archive == SOURCE_ARCHIVE_ZIPBALL \
+            and getattr(package, 'source_archive', None) == SOURCE_ARCHIVE_ZIPBALL \
+            and package.version and package.version_type == 'version' and package.version != version:
+        stats = delta_update(repo_api_url, package, version)
+        if stats is not None:
+            update_package_data_file(repo_data, package, package.content_path, version, version_type, update,
+                                     source_archive)
+            hou.ui.setStatusMessage(
+                f'Updated {package.name} with {stats.downloaded_files} changed files: '
+                f'{stats.downloaded_bytes / 1024:.0f} KB downloaded, '
+                f'about {stats.saved_bytes() / 1024:.0f} KB and {stats.saved_time():.1f} s saved',
+                hou.severityType.ImportantMessage,
+            )
+            return True
+
+    try:
+        zip_file = download_file(asset_url, size=asset_size, digest=asset_digest, validator=asset_validator)
+    except DownloadCancelledError:
+        return False
     if update:
         dst_location, dst_name = os.path.split(package.content_path)
         package_location = extract_repo_zip(zip_file, repo_data, dst_location, dst_name)
     else:
         package_location = extract_repo_zip(zip_file, repo_data, dst_location)
-    os.remove(zip_file)
 
-    update_package_data_file(repo_data, package, package_location, version, version_type, update)
+    update_package_data_file(repo_data, package, package_location, version, version_type, update, source_archive)
 
     if not update:
         LocalPackage.install(package_location, setup_schema=package.setup_schema or setup_schema)
@@ -428,12 +782,21 @@ def repo_has_update(
     repo_owner, repo_name = owner_and_repo_name(link)
 
     repo_api_url = f'https://api.github.com/repos/{repo_owner}/{repo_name}'
+    metadata = repo_metadata(repo_owner, repo_name)
     if version_type == 'time_github':
-        repo_data = API.get(repo_api_url)
-        latest_version = parse_timestamp(repo_data['pushed_at'])
+        if metadata is not None and metadata.pushed_at:
+            latest_version = parse_timestamp(metadata.pushed_at)
+        else:
+            repo_data = API.get(repo_api_url)
+            latest_version = parse_timestamp(repo_data['pushed_at'])
         version = parse_timestamp(version)
         # TODO: support only_stable
     else:  # version_type == 'version':
+        if metadata is not None:
+            latest_tag = metadata.latest_release if only_stable else metadata.latest_tag
+            if latest_tag is None:
+                return False
+            return Version(latest_tag) > version
         if only_stable:
             latest_release_api_url = repo_api_url + '/releases/latest'
             try:
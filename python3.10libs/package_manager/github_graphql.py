@@ -0,0 +1,112 @@
+from collections.abc import Callable
+from collections.abc import Iterable
+
+
+GRAPHQL_URL = 'https://api.github.com/graphql'
+
+# GitHub limits the number of nodes a query may request, 50 repositories stay far below it
+BATCH_SIZE = 50
+
+REPO_FIELDS = '''
+    description
+    pushedAt
+    owner {
+      login
+      ... on User { name }
+      ... on Organization { name }
+    }
+    latestRelease { tagName }
+    releases(first: 1, orderBy: {field: CREATED_AT, direction: DESC}) { nodes { tagName } }
+'''
+
+# Takes a request payload, returns the decoded response
+Post = Callable[[dict], dict]
+
+
+class GraphQLError(IOError):
+    pass
+
+
+class RepoMetadata:
+    __slots__ = 'owner', 'name', 'description', 'pushed_at', 'owner_login', 'owner_name', 'latest_release', 'latest_tag'
+
+    def __init__(
+            self,
+            owner: str,
+            name: str,
+            description: str | None = None,
+            pushed_at: str | None = None,
+            owner_login: str | None = None,
+            owner_name: str | None = None,
+            latest_release: str | None = None,
+            latest_tag: str | None = None,
+    ) -> None:
+        self.owner = owner
+        self.name = name
+        self.description = description
+        self.pushed_at = pushed_at
+        self.owner_login = owner_login or owner
+        self.owner_name = owner_name
+        self.latest_release = latest_release  # Latest stable release, like /releases/latest
+        self.latest_tag = latest_tag  # Latest release of any kind, like /releases[0]
+
+
+def repo_key(owner: str, name: str) -> tuple[str, str]:
+    # GitHub names are case-insensitive
+    return owner.lower(), name.lower()
+
+
+def build_query(repos: list[tuple[str, str]]) -> dict:
+    # Every repository gets an alias in a single query, names are passed as variables
+    variables = {}
+    definitions = []
+    fields = []
+    for index, (owner, name) in enumerate(repos):
+        variables[f'o{index}'] = owner
+        variables[f'n{index}'] = name
+        definitions.append(f'$o{index}: String!, $n{index}: String!')
+        fields.append(f'r{index}: repository(owner: $o{index}, name: $n{index}) {{{REPO_FIELDS}}}')
+    query = f'query({", ".join(definitions)}) {{\n' + '\n'.join(fields) + '\n}'
+    return {'query': query, 'variables': variables}
+
+
+def parse_repo(owner: str, name: str, data: dict) -> RepoMetadata:
+    owner_data = data.get('owner') or {}
+    latest_release = data.get('latestRelease') or {}
+    releases = (data.get('releases') or {}).get('nodes') or [{}]
+    return RepoMetadata(
+        owner,
+        name,
+        description=data.get('description'),
+        pushed_at=data.get('pushedAt'),
+        owner_login=owner_data.get('login'),
+        owner_name=owner_data.get('name'),
+        latest_release=latest_release.get('tagName'),
+        latest_tag=releases[0].get('tagName'),
+    )
+
+
+def fetch_metadata(
+        repos: Iterable[tuple[str, str]],
+        post: Post,
+        batch_size: int = BATCH_SIZE,
+) -> dict[tuple[str, str], RepoMetadata | None]:
+    # Missing and inaccessible repositories are mapped to None.
+    # Raises GraphQLError when a whole batch fails, so the caller can fall back to the REST API.
+    unique_repos = {}
+    for owner, name in repos:
+        unique_repos.setdefault(repo_key(owner, name), (owner, name))
+    repos = list(unique_repos.values())
+
+    results = {}
+    for start in range(0, len(repos), batch_size):
+        batch = repos[start:start + batch_size]
+        response = post(build_query(batch))
+        data = response.get('data')
+        if not data:
+            errors = response.get('errors') or [{}]
+            raise GraphQLError(errors[0].get('message', 'Empty GraphQL response'))
+        for index, (owner, name) in enumerate(batch):
+            repo_data = data.get(f'r{index}')
+            results[repo_key(owner, name)] = parse_repo(owner, name, repo_data) if repo_data else None
+    return results
@@ -0,0 +1,91 @@
+import json
+import re
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+from package_manager import network
+from package_manager.github_graphql import GraphQLError
+from package_manager.github_graphql import build_query
+from package_manager.github_graphql import fetch_metadata
+
+
+def fake_repo(owner: str, name: str) -> dict | None:
+    if name.startswith('missing'):
+        return None
+    return {
+        'description': f'{name} description',
+        'pushedAt': '2024-01-02T03:04:05Z',
+        'owner': {'login': owner, 'name': owner.title()},
+        'latestRelease': {'tagName': 'v1.0'} if name != 'no_releases' else None,
+        'releases': {'nodes': [{'tagName': 'v1.1-beta'}] if name != 'no_releases' else []},
+    }
+
+
+class GraphQLHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self) -> None:
+        payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        self.server.requests.append(payload)
+        variables = payload['variables']
+        aliases = re.findall(r'(r\d+): repository\(owner: \$(o\d+), name: \$(n\d+)\)', payload['query'])
+        if not aliases:
+            response = {'errors': [{'message': 'Bad query'}]}
+        else:
+            data = {alias: fake_repo(variables[owner], variables[name]) for alias, owner, name in aliases}
+            response = {'data': data}
+        body = json.dumps(response).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def server(http_server):
+    return http_server(GraphQLHandler)
+
+
+@pytest.fixture
+def post(server):
+    return lambda payload: network.post(f'{server.url}/graphql', json=payload).json()
+
+
+def test_build_query():
+    payload = build_query([('owner', 'repo'), ('other', 'repo"')])
+    assert payload['variables'] == {'o0': 'owner', 'n0': 'repo', 'o1': 'other', 'n1': 'repo"'}
+    assert 'r1: repository(owner: $o1, name: $n1)' in payload['query']
+    assert 'repo"' not in payload['query']
+
+
+def test_metadata(post):
+    results = fetch_metadata([('Owner', 'repo'), ('owner', 'no_releases'), ('owner', 'missing')], post)
+    metadata = results['owner', 'repo']
+    assert metadata.description == 'repo description'
+    assert metadata.pushed_at == '2024-01-02T03:04:05Z'
+    assert metadata.owner_login == 'Owner'
+    assert metadata.owner_name == 'Owner'
+    assert metadata.latest_release == 'v1.0'
+    assert metadata.latest_tag == 'v1.1-beta'
+
+    assert results['owner', 'no_releases'].latest_release is None
+    assert results['owner', 'no_releases'].latest_tag is None
+    assert results['owner', 'missing'] is None
+
+
+def test_round_trips(server, post):
+    # The REST API needs a repository, a release and an owner request per repository
+    repos = [(f'owner{i}', f'repo{i}') for i in range(120)]
+    results = fetch_metadata(repos + repos[:10], post, batch_size=50)
+    assert len(results) == 120
+    assert len(server.requests) == 3  # Instead of 360
+
+
+def test_failed_batch(post):
+    with pytest.raises(GraphQLError, match='Bad query'):
+        fetch_metadata([('owner', 'repo')], lambda payload: post({'query': '{}', 'variables': {}}))
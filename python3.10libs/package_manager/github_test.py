@@ -0,0 +1,109 @@
+import hashlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler
+from time import sleep
+from time import time
+
+import pytest
+
+from package_manager.api_cache import APICache
+from package_manager.api_cache import CacheItem
+from package_manager.rate_limit import RateLimiter
+from package_manager.single_flight import SingleFlight
+
+
+API = pytest.importorskip('package_manager.github', reason='Needs Houdini').API
+
+
+class RepoHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self) -> None:
+        self.server.requests.append(self.path)
+        self.server.release.wait(5)
+        body = json.dumps(self.server.data).encode()
+        etag = '"' + hashlib.sha1(body, usedforsecurity=False).hexdigest() + '"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            body = b''
+        else:
+            self.send_response(200)
+            self.send_header('ETag', etag)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def server(http_server):
+    release = threading.Event()
+    release.set()
+    return http_server(RepoHandler, data={'description': 'new'}, release=release)
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = APICache(str(tmp_path / 'cache.db'), freshness_rules=((r'', 60, 3600),))
+    monkeypatch.setattr(API, '_cache', cache)
+    monkeypatch.setattr(API, 'rate_limit', RateLimiter())
+    monkeypatch.setattr(API, '_in_flight', SingleFlight())
+    yield cache
+    cache.close()
+
+
+def wait_for_revalidation(url: str, timeout: float = 5) -> None:
+    deadline = time() + timeout
+    while url in API._revalidating and time() < deadline:
+        sleep(0.01)
+
+
+def test_stale_read_revalidates_in_background(server, cache):
+    url = f'{server.url}/repos/owner/repo'
+    cache.set(url, CacheItem({'description': 'old'}, etag='"old"', fetched_at=time() - 120))
+
+    # The server holds the response, the stale data is returned without waiting for it
+    server.release.clear()
+    assert API.get(url) == {'description': 'old'}
+    server.release.set()
+
+    wait_for_revalidation(url)
+    assert server.requests == ['/repos/owner/repo']
+    item = cache.get(url)
+    assert item.data == {'description': 'new'}
+    assert cache.freshness(url, item) == 'fresh'
+    assert API.get(url) == {'description': 'new'}
+    assert len(server.requests) == 1
+
+
+def test_not_modified_renews_the_cached_item(server, cache):
+    url = f'{server.url}/repos/owner/repo'
+    API.get(url)
+    item = cache.get(url)
+    item.fetched_at = time() - 86400  # Outdated, revalidated before it is used
+
+    assert API.get(url) == {'description': 'new'}
+    assert cache.get(url) is item
+    assert cache.freshness(url, item) == 'fresh'
+    assert len(server.requests) == 2
+
+
+def test_concurrent_requests_share_one_round_trip(server, cache):
+    url = f'{server.url}/repos/owner/repo'
+    cache.set(url, CacheItem({'description': 'old'}, etag='"old"', fetched_at=time() - 86400))
+
+    server.release.clear()
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(API.get(url))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    sleep(0.2)  # Every thread is waiting for the one request held by the server
+    server.release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == [{'description': 'new'}] * 8
+    assert len(server.requests) == 1
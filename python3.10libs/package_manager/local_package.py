@@ -1,6 +1,7 @@
 import json
 import os
 from collections.abc import Generator
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 import hou
@@ -8,8 +9,11 @@ import hou
 from package_manager.houdini_license import full_houdini_license_name
 from package_manager.package import Package
 from package_manager.package import is_package
+from package_manager.package_registry import PackageRegistry
 from package_manager.package_status import full_package_status_name
 from package_manager.setup_schema import make_setup_schema
+from package_manager.staging import remove_backups
+from package_manager.update_options import UpdateOptions
 
 
 class NotPackageError(IOError):
@@ -75,6 +79,9 @@ class LocalPackage(Package):
         with open(package_file) as file:
             data = json.load(file)
 
+        # Kept with the record, the package file is read again only when it changes
+        self.__enabled = data.get('enable', True)
+
         self.content_path = os.path.normpath(hou.expandString(data['path'])).replace('\\', '/')
         if not os.path.isdir(self.content_path):
             raise OSError(self.content_path)
@@ -99,6 +106,11 @@ class LocalPackage(Package):
         self.hlicense = full_houdini_license_name(data.get('hlicense'))
         self.status = full_package_status_name(data.get('status'))
         self.setup_schema = data.get('setup_schema')
+        self.source_archive = data.get('source_archive')  # Zipball or release asset, None if unknown
+
+    def dependencies(self) -> tuple[str, ...]:
+        # Files the package data is read from, besides the package file
+        return self.content_path, os.path.join(self.content_path, 'package.setup')
 
     def files(
             self,
@@ -137,12 +149,7 @@ class LocalPackage(Package):
         return os.path.isfile(self.package_file)
 
     def is_enabled(self) -> bool:
-        try:
-            with open(self.package_file, encoding='utf-8') as file:
-                data = json.load(file)
-                return data.get('enable', True)
-        except OSError:
-            return False  # TODO: raise NotInstalledError?
+        return self.__enabled
 
     def enable(self, enable: bool = True) -> None:
         # TODO: check if not installed
@@ -151,6 +158,7 @@ class LocalPackage(Package):
         with open(self.package_file, 'w') as file:
             data['enable'] = enable
             json.dump(data, file, indent=4)
+        self.__enabled = enable
 
     @staticmethod
     def install(content_path: str, enable: bool = True, setup_schema: Any = None) -> None:
@@ -195,6 +203,7 @@ class LocalPackage(Package):
     def uninstall(self) -> None:
         # TODO: optional remove package content folder
         os.remove(self.package_file)
+        remove_backups(self.content_path)
 
     def __repr__(self) -> str:
         return f'Package(r"{self.package_file}")'
@@ -203,42 +212,50 @@ class LocalPackage(Package):
         return self.content_path
 
 
-def find_installed_packages() -> tuple[LocalPackage, ...]:
-    def jsons_from_folder_alphabetical(path: str) -> list[str]:
-        if not os.path.isdir(path):
-            return []
-        file_paths = []
-        for file in os.listdir(path):
-            file_path = os.path.join(path, file)
-            if file.endswith('.json') and os.path.isfile(file_path):
-                file_paths.append(file_path)
-        return sorted(file_paths)
+_registry = PackageRegistry(LocalPackage, LocalPackage.dependencies)
+
 
-    json_paths = []
+def package_registry() -> PackageRegistry:
+    return _registry
 
-    packages_path = hou.expandString('$HOUDINI_USER_PREF_DIR/packages')
-    json_paths.extend(jsons_from_folder_alphabetical(packages_path))
 
-    packages_path = hou.expandString('$HFS/packages')
-    json_paths.extend(jsons_from_folder_alphabetical(packages_path))
+def package_roots() -> list[str]:
+    # Folders containing package files, in the order of precedence
+    packages_paths = [
+        hou.expandString('$HOUDINI_USER_PREF_DIR/packages'),
+        hou.expandString('$HFS/packages'),
+    ]
 
     if hou.getenv('HSITE') is not None:
         major, minor, build = hou.applicationVersion()
-        packages_path = hou.expandString(f'$HSITE/houdini{major}.{minor}/packages')
-        json_paths.extend(jsons_from_folder_alphabetical(packages_path))
+        packages_paths.append(hou.expandString(f'$HSITE/houdini{major}.{minor}/packages'))
 
     if hou.getenv('HOUDINI_PACKAGE_DIR') is not None:
-        packages_path = hou.expandString('$HOUDINI_PACKAGE_DIR')
-        json_paths.extend(jsons_from_folder_alphabetical(packages_path))
+        packages_paths.append(hou.expandString('$HOUDINI_PACKAGE_DIR'))
 
     # TODO: support dynamic setting of the package dir if possible
 
-    packages = []
-    for path in json_paths:
-        try:
-            package = LocalPackage(path)
-            packages.append(package)
-        except Exception:
-            continue
+    return packages_paths
+
+
+def find_installed_packages(max_workers: int | None = None) -> tuple[LocalPackage, ...]:
+    def jsons_from_folder_alphabetical(path: str) -> list[str]:
+        if not os.path.isdir(path):
+            return []
+        file_paths = []
+        for file in os.listdir(path):
+            file_path = os.path.join(path, file)
+            if file.endswith('.json') and os.path.isfile(file_path):
+                file_paths.append(file_path)
+        return sorted(file_paths)
+
+    if max_workers is None:
+        max_workers = UpdateOptions().discovery_workers()
+
+    # Roots may be on network drives, they are listed concurrently and joined in the order of precedence
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='package_manager') as executor:
+        json_paths = [path for paths in executor.map(jsons_from_folder_alphabetical, package_roots())
+                      for path in paths]
 
-    return tuple(packages)
+    # Only new and changed package files are parsed again
+    return _registry.refresh(json_paths, max_workers)
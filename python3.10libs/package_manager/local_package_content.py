@@ -16,6 +16,7 @@ from PySide2.QtWidgets import QFormLayout
 from PySide2.QtWidgets import QGroupBox
 from PySide2.QtWidgets import QLabel
 from PySide2.QtWidgets import QListView
+from PySide2.QtWidgets import QMessageBox
 from PySide2.QtWidgets import QPushButton
 from PySide2.QtWidgets import QSizePolicy
 from PySide2.QtWidgets import QSpacerItem
@@ -24,6 +25,7 @@ from PySide2.QtWidgets import QWidget
 
 from package_manager import github
 from package_manager import pypanel
+from package_manager import update
 from package_manager.link_label import LinkLabel
 from package_manager.local_package import LocalPackage
 from package_manager.package import Package
@@ -55,6 +57,7 @@ class PackageInfoView(QWidget):
     enabled = Signal()
     disabled = Signal()
     uninstalled = Signal()
+    rolled_back = Signal()
 
     def __init__(self) -> None:
         super(PackageInfoView, self).__init__()
@@ -153,6 +156,11 @@ class PackageInfoView(QWidget):
         self.check_only_stable_toggle.toggled.connect(self._on_toggle_check_only_stable)
         update_layout.addWidget(self.check_only_stable_toggle)
 
+        self.rollback_button = QPushButton('Roll Back Update')
+        self.rollback_button.setToolTip('Restore the version replaced by the last update')
+        self.rollback_button.clicked.connect(self._on_rollback)
+        update_layout.addWidget(self.rollback_button)
+
         # TODO: update button
 
         # Enable/Disable
@@ -238,6 +246,8 @@ class PackageInfoView(QWidget):
             self.check_only_stable_toggle.setChecked(only_stable)
             self.check_only_stable_toggle.blockSignals(False)
 
+            self.rollback_button.setEnabled(update.can_rollback_package(self.__package))
+
             self.update_group.show()
         else:
             self.update_group.hide()
@@ -275,11 +285,21 @@ class PackageInfoView(QWidget):
         self.update_from_current_package()
         self.disabled.emit()
 
+    def _on_rollback(self) -> None:
+        # noinspection PyTypeChecker
+        reply = QMessageBox.question(self, 'Package Manager: Roll Back',
+                                     f'Restore the version of "{self.__package.name}" replaced by the last update?',
+                                     QMessageBox.Yes | QMessageBox.No)
+        if reply != QMessageBox.Yes:
+            return
+        update.rollback_package(self.__package)
+        self.rolled_back.emit()
+
     def _on_uninstall(self) -> None:
         self.__package.uninstall()
-        self.uninstalled.emit()
         self.__package = None
         self.update_from_current_package()
+        self.uninstalled.emit()  # The list may select another package
 
 
 class OperatorListModel(QAbstractListModel):
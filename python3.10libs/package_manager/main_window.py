@@ -2,9 +2,12 @@ import hou
 from PySide2.QtCore import QModelIndex
 from PySide2.QtCore import QSize
 from PySide2.QtCore import Qt
+from PySide2.QtGui import QCloseEvent
 from PySide2.QtGui import QKeyEvent
+from PySide2.QtGui import QShowEvent
 from PySide2.QtWidgets import QButtonGroup
 from PySide2.QtWidgets import QHBoxLayout
+from PySide2.QtWidgets import QLineEdit
 from PySide2.QtWidgets import QPushButton
 from PySide2.QtWidgets import QSizePolicy
 from PySide2.QtWidgets import QSpacerItem
@@ -14,6 +17,7 @@ from PySide2.QtWidgets import QTabWidget
 from PySide2.QtWidgets import QVBoxLayout
 from PySide2.QtWidgets import QWidget
 
+from package_manager.local_package import LocalPackage
 from package_manager.local_package import find_installed_packages
 from package_manager.local_package_content import OperatorListModel
 from package_manager.local_package_content import OperatorListView
@@ -26,8 +30,11 @@ from package_manager.local_package_content import ShelfToolListModel
 from package_manager.local_package_content import ShelfToolListView
 from package_manager.package_list import PackageListModel
 from package_manager.package_list import PackageListView
+from package_manager.package_registry import RegistryChanges
+from package_manager.package_watcher import PackageWatcher
 from package_manager.settings import SettingsWidget
 from package_manager.web_package_content import WebPackageInfoView
+from package_manager.web_package_list import WebPackageFilterModel
 from package_manager.web_package_list import WebPackageListModel
 from package_manager.web_package_list import WebPackageListView
 
@@ -109,13 +116,19 @@ class MainWindow(QWidget):
         local_layout.addWidget(splitter)
 
         self.package_list_model = PackageListModel(self)
-        self.update_local_package_list()
 
-        package_list_view = PackageListView()
-        package_list_view.setModel(self.package_list_model)
-        selection_model = package_list_view.selectionModel()
+        self.package_list_view = PackageListView()
+        self.package_list_view.setModel(self.package_list_model)
+        selection_model = self.package_list_view.selectionModel()
         selection_model.currentChanged.connect(self._set_current_package)
-        splitter.addWidget(package_list_view)
+        splitter.addWidget(self.package_list_view)
+
+        # While the window is open, every refresh of the installed packages, made here or elsewhere, updates the list.
+        # The watcher also refreshes them when packages are installed, removed or edited outside of the window.
+        find_installed_packages()
+        self.package_watcher = PackageWatcher(self)
+        self.package_watcher.packages_reset.connect(self._on_installed_packages_reset)
+        self.package_watcher.packages_changed.connect(self._on_installed_packages_changed)
 
         self.package_content_tabs = QTabWidget()
         self.package_content_tabs.setStyleSheet('QTabWidget::pane { border: 0; }')
@@ -129,6 +142,7 @@ class MainWindow(QWidget):
         general_view.enabled.connect(self.update_local_package_list)
         general_view.disabled.connect(self.update_local_package_list)
         general_view.uninstalled.connect(self.update_local_package_list)
+        general_view.rolled_back.connect(self.update_local_package_list)
         self.package_content_tabs.addTab(general_view, 'General')
 
         operator_list_view = OperatorListView()
@@ -159,12 +173,30 @@ class MainWindow(QWidget):
         web_layout.addWidget(splitter)
 
         self.web_list_model = WebPackageListModel(self)
+        self.web_filter_model = WebPackageFilterModel(self)
+        self.web_filter_model.setSourceModel(self.web_list_model)
+
+        web_list_widget = QWidget()
+        splitter.addWidget(web_list_widget)
+
+        web_list_layout = QVBoxLayout(web_list_widget)
+        web_list_layout.setContentsMargins(0, 0, 0, 0)
+        web_list_layout.setSpacing(4)
+
+        self.web_search_field = QLineEdit()
+        self.web_search_field.setPlaceholderText('Search')
+        self.web_search_field.setToolTip('Search\tCtrl+F\n'
+                                         'Words are matched in name, description, author, status and license.\n'
+                                         'Limit a word to a field like "status:stable" or "license:indie".')
+        self.web_search_field.setClearButtonEnabled(True)
+        self.web_search_field.textChanged.connect(self.web_filter_model.set_query)
+        web_list_layout.addWidget(self.web_search_field)
 
         self.web_list_view = WebPackageListView()
-        self.web_list_view.setModel(self.web_list_model)
+        self.web_list_view.setModel(self.web_filter_model)
         selection_model = self.web_list_view.selectionModel()
         selection_model.currentChanged.connect(self._set_current_web_package)
-        splitter.addWidget(self.web_list_view)
+        web_list_layout.addWidget(self.web_list_view)
 
         self.web_info_view = WebPackageInfoView()
         self.web_info_view.installed.connect(self.update_web_package_list)
@@ -186,8 +218,15 @@ class MainWindow(QWidget):
         self.current_web_package = None
 
     def update_local_package_list(self) -> None:
-        self.package_list_model.set_package_list(find_installed_packages())
-        self.current_package = None
+        find_installed_packages()  # The changes are applied to the list by _on_installed_packages_changed
+
+    def update_current_package(self) -> None:
+        # The current row may hold a reloaded package
+        index = self.package_list_view.currentIndex()
+        package = index.data(Qt.UserRole) if index.isValid() else None
+        if package is not self.current_package:
+            self.current_package = package
+            self.update_content_source()
 
     def update_web_package_list(self) -> None:
         self.web_list_model.update_data()
@@ -209,9 +248,26 @@ class MainWindow(QWidget):
         self.current_web_package = web_package
         self.update_web_content_source()
 
+    def _on_installed_packages_reset(self, packages: tuple[LocalPackage, ...]) -> None:
+        self.package_list_model.set_package_list(packages)
+        self.update_current_package()
+
+    def _on_installed_packages_changed(self, changes: RegistryChanges) -> None:
+        self.package_list_model.apply_changes(changes)
+        self.update_current_package()
+
     def _switch_panel(self, panel_id: int) -> None:
         self.stack_layout.setCurrentIndex(panel_id)
 
+    def showEvent(self, event: QShowEvent) -> None:
+        self.package_watcher.start()
+        super(MainWindow, self).showEvent(event)
+
+    def closeEvent(self, event: QCloseEvent) -> None:
+        self.web_list_model.cancel()
+        self.package_watcher.stop()
+        super(MainWindow, self).closeEvent(event)
+
     def keyPressEvent(self, event: QKeyEvent) -> None:
         key = event.key()
         modifiers = event.modifiers()
@@ -224,6 +280,9 @@ class MainWindow(QWidget):
         elif modifiers == Qt.NoModifier and key == Qt.Key_F1:
             desktop = hou.ui.curDesktop()
             desktop.displayHelpPath('/ref/windows/package_manager')
+        elif modifiers == Qt.ControlModifier and key == Qt.Key_F and self.stack_layout.currentIndex() == 1:
+            self.web_search_field.setFocus()
+            self.web_search_field.selectAll()
         elif modifiers == Qt.ControlModifier and key == Qt.Key_1:
             self.local_mode_button.setChecked(True)
             self._switch_panel(0)
@@ -0,0 +1,83 @@
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+USER_AGENT = 'Houdini-Package-Manager'
+
+POOL_SIZE = 16
+RETRIES = 3
+BACKOFF_FACTOR = 0.25
+RETRY_STATUSES = (500, 502, 503, 504)
+TIMEOUT = (5, 30)  # Connect, read
+
+def make_session(
+        pool_size: int = POOL_SIZE,
+        retries: int = RETRIES,
+        backoff_factor: float = BACKOFF_FACTOR,
+) -> requests.Session:
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=('GET', 'HEAD'),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.headers['User-Agent'] = USER_AGENT
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+# Connections are pooled by one session shared by all the requests, configure() replaces it
+class SharedSession:
+    _session: requests.Session | None = None
+    _lock = threading.Lock()
+    timeout: float | tuple[float, float] = TIMEOUT
+
+    @staticmethod
+    def get() -> requests.Session:
+        if SharedSession._session is None:
+            with SharedSession._lock:
+                if SharedSession._session is None:
+                    SharedSession._session = make_session()
+        return SharedSession._session
+
+    @staticmethod
+    def replace(session: requests.Session | None, timeout: float | tuple[float, float] = TIMEOUT) -> None:
+        with SharedSession._lock:
+            old_session = SharedSession._session
+            SharedSession._session = session
+            SharedSession.timeout = timeout
+        if old_session is not None:
+            old_session.close()
+
+
+def session() -> requests.Session:
+    return SharedSession.get()
+
+
+def configure(
+        pool_size: int = POOL_SIZE,
+        retries: int = RETRIES,
+        backoff_factor: float = BACKOFF_FACTOR,
+        timeout: float | tuple[float, float] = TIMEOUT,
+) -> None:
+    SharedSession.replace(make_session(pool_size, retries, backoff_factor), timeout)
+
+
+def get(url: str, timeout: float | tuple[float, float] | None = None, **kwargs) -> requests.Response:
+    return session().get(url, timeout=timeout or SharedSession.timeout, **kwargs)
+
+
+def post(url: str, timeout: float | tuple[float, float] | None = None, **kwargs) -> requests.Response:
+    # Not retried by the session, POST is not idempotent
+    return session().post(url, timeout=timeout or SharedSession.timeout, **kwargs)
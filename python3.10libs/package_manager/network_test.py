@@ -0,0 +1,68 @@
+import json
+from http.server import BaseHTTPRequestHandler
+from time import sleep
+
+import pytest
+import requests
+
+from package_manager import network
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self) -> None:
+        self.respond()
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self.respond()
+
+    def respond(self) -> None:
+        self.server.requests.append((self.command, self.headers.get('User-Agent')))
+        sleep(self.server.delay)
+        failing = len(self.server.requests) <= self.server.failures
+        body = json.dumps({'ok': not failing}).encode()
+        self.send_response(503 if failing else 200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@pytest.fixture(autouse=True)
+def shared_session():
+    network.configure(backoff_factor=0)
+    yield
+    network.SharedSession.replace(None)
+
+
+def test_user_agent_and_shared_session(http_server):
+    server = http_server(FlakyHandler, failures=0, delay=0)
+    assert network.get(server.url).json() == {'ok': True}
+    assert server.requests == [('GET', network.USER_AGENT)]
+    assert network.session() is network.session()
+
+
+def test_get_is_retried(http_server):
+    server = http_server(FlakyHandler, failures=2, delay=0)
+    response = network.get(server.url)
+    assert response.status_code == 200
+    assert len(server.requests) == 3
+
+
+def test_post_is_not_retried(http_server):
+    server = http_server(FlakyHandler, failures=1, delay=0)
+    response = network.post(server.url, json={})
+    assert response.status_code == 503
+    assert server.requests == [('POST', network.USER_AGENT)]
+
+
+def test_configured_timeout(http_server):
+    server = http_server(FlakyHandler, failures=0, delay=0.5)
+    network.configure(retries=0, timeout=0.1)
+    with pytest.raises(requests.ConnectionError, match='Read timed out'):  # Wrapped by the retry adapter
+        network.get(server.url)
+    assert network.get(server.url, timeout=5).json() == {'ok': True}
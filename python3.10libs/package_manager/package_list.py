@@ -8,6 +8,9 @@ from PySide2.QtCore import Qt
 from PySide2.QtWidgets import QListView
 from PySide2.QtWidgets import QWidget
 
+from package_manager.package_registry import RegistryChanges
+from package_manager.package_registry import row_changes
+
 
 class PackageListModel(QAbstractListModel):
     # Icons
@@ -17,13 +20,29 @@ class PackageListModel(QAbstractListModel):
     def __init__(self, parent: QWidget | None = None) -> None:
         super(PackageListModel, self).__init__(parent)
 
-        self.__data = ()
+        self.__data = []
 
     def set_package_list(self, packages: Collection[dict]) -> None:
         self.beginResetModel()
-        self.__data = tuple(packages)
+        self.__data = list(packages)
         self.endResetModel()
 
+    def apply_changes(self, changes: RegistryChanges) -> None:
+        # Rows are removed, replaced and inserted one by one, so the selection and the scroll position are kept
+        for operation, row, package in row_changes(self.__data, changes):
+            if operation == 'remove':
+                self.beginRemoveRows(QModelIndex(), row, row)
+                del self.__data[row]
+                self.endRemoveRows()
+            elif operation == 'replace':
+                self.__data[row] = package
+                index = self.index(row, 0)
+                self.dataChanged.emit(index, index)
+            else:
+                self.beginInsertRows(QModelIndex(), row, row)
+                self.__data.insert(row, package)
+                self.endInsertRows()
+
     def rowCount(self, parent: QModelIndex) -> int:
         return len(self.__data)
 
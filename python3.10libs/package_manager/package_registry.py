@@ -0,0 +1,163 @@
+import os
+import threading
+from collections.abc import Callable
+from collections.abc import Iterable
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+
+Stamp = tuple[int, int] | None  # Modification time and size, None if missing
+
+
+def file_stamp(path: str) -> Stamp:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class RegistryChanges:
+    __slots__ = 'added', 'removed', 'changed', 'records'
+
+    def __init__(self, added: list, removed: list, changed: list[tuple[Any, Any]], records: tuple = ()) -> None:
+        self.added = added
+        self.removed = removed
+        self.changed = changed  # (old, new) pairs
+        self.records = records  # All records after the changes, in the order of the paths
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+
+# Keeps the records loaded from package files and reloads only the files that have changed.
+# A record is reused while the stamps of its file and of its dependencies (returned by
+# `dependencies`, like the content folder and its package.setup) are the same.
+# Files failed to load are retried on every refresh, their content may appear later.
+# Listeners are called with RegistryChanges after every refresh that changed something.
+# They are called with the registry locked and must not refresh it.
+# With several workers, the files are checked and loaded concurrently, which pays off
+# on network drives where every stat and read is slow.
+class PackageRegistry:
+    def __init__(
+            self,
+            load: Callable[[str], Any],
+            dependencies: Callable[[Any], Iterable[str]] = lambda record: (),
+    ) -> None:
+        self.load = load
+        self.dependencies = dependencies
+
+        self._lock = threading.Lock()
+        self._records: dict[str, tuple[tuple[tuple[str, Stamp], ...] | None, Any]] = {}
+        self._listeners: list[Callable[[RegistryChanges], None]] = []
+
+    def subscribe(self, listener: Callable[[RegistryChanges], None]) -> tuple:
+        # Returns the current records, the listener is called for every change made after them
+        with self._lock:
+            self._listeners.append(listener)
+            return tuple(record for _, record in self._records.values())
+
+    def unsubscribe(self, listener: Callable[[RegistryChanges], None]) -> None:
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def _is_valid(self, stamps: tuple[tuple[str, Stamp], ...] | None) -> bool:
+        return stamps is not None and all(file_stamp(path) == stamp for path, stamp in stamps)
+
+    def _load(self, path: str) -> tuple[tuple[tuple[str, Stamp], ...], Any] | None:
+        stamp = file_stamp(path)
+        try:
+            record = self.load(path)
+        except Exception:  # Not a package, broken file, ...
+            return None
+        stamps = ((path, stamp),) + tuple((dependency, file_stamp(dependency))
+                                          for dependency in self.dependencies(record))
+        return stamps, record
+
+    def refresh(self, paths: Sequence[str], max_workers: int = 1) -> tuple:
+        # Returns the records in the order of the paths
+        with self._lock:
+            old_records = self._records
+
+            def check(path: str) -> tuple[tuple[tuple[str, Stamp], ...], Any] | None:
+                entry = old_records.get(path)
+                if entry is not None and self._is_valid(entry[0]):
+                    return entry
+                return self._load(path)
+
+            if max_workers > 1 and len(paths) > 1:
+                with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='package_manager') as executor:
+                    entries = list(executor.map(check, paths))
+            else:
+                entries = list(map(check, paths))
+
+            new_records = {}
+            reloaded = []
+            for path, entry in zip(paths, entries, strict=True):
+                if entry is not None:
+                    new_records[path] = entry
+                if entry is None or old_records.get(path) is not entry:
+                    reloaded.append(path)
+            self._records = new_records
+
+            added = []
+            changed = []
+            for path in reloaded:
+                if path not in new_records:
+                    continue
+                if path in old_records:
+                    changed.append((old_records[path][1], new_records[path][1]))
+                else:
+                    added.append(new_records[path][1])
+            removed = [entry[1] for path, entry in old_records.items() if path not in new_records]
+            records = tuple(new_records[path][1] for path in paths if path in new_records)
+
+            # Called while locked, so the changes are reported in the order of the refreshes
+            changes = RegistryChanges(added, removed, changed, records)
+            if changes:
+                for listener in tuple(self._listeners):
+                    listener(changes)
+        return records
+
+    def invalidate(self, path: str | None = None) -> None:
+        # Forces the file (or all files) to be loaded again on the next refresh
+        with self._lock:
+            for record_path, (_, record) in tuple(self._records.items()):
+                if path is None or record_path == path:
+                    self._records[record_path] = None, record
+
+    def records(self) -> tuple:
+        # In the order of the paths of the last refresh
+        with self._lock:
+            return tuple(record for _, record in self._records.values())
+
+
+def row_changes(rows: Sequence, changes: RegistryChanges) -> list[tuple[str, int, Any]]:
+    # Turns the changes into ("remove", row, None), ("replace", row, record) and ("insert", row, record)
+    # operations, which applied in order to the rows holding the records before the changes
+    # give the records after them. Records are matched by identity.
+    rows = list(rows)
+    operations = []
+
+    removed = {id(record) for record in changes.removed}
+    for row in reversed(range(len(rows))):
+        if id(rows[row]) in removed:
+            operations.append(('remove', row, None))
+            del rows[row]
+
+    changed = {id(old_record): new_record for old_record, new_record in changes.changed}
+    for row, record in enumerate(rows):
+        new_record = changed.get(id(record))
+        if new_record is not None:
+            operations.append(('replace', row, new_record))
+            rows[row] = new_record
+
+    added = {id(record) for record in changes.added}
+    for row, record in enumerate(changes.records):
+        if id(record) in added:
+            operations.append(('insert', row, record))
+            rows.insert(row, record)
+
+    return operations
@@ -0,0 +1,203 @@
+import json
+import os
+
+from package_manager.package_registry import PackageRegistry
+from package_manager.package_registry import row_changes
+
+
+class Record:
+    def __init__(self, path):
+        with open(path) as file:
+            data = json.load(file)
+        self.path = path
+        self.name = data['name']
+        self.content_path = data['content_path']
+
+
+def make_package(tmp_path, name, content_path=None):
+    file_path = tmp_path / f'{name}.json'
+    file_path.write_text(json.dumps({'name': name, 'content_path': content_path or str(tmp_path / name)}))
+    return str(file_path)
+
+
+def touch(path, offset=1):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + offset * 1_000_000_000))
+
+
+def make_registry(loaded):
+    def load(path):
+        loaded.append(path)
+        return Record(path)
+
+    return PackageRegistry(load, lambda record: (record.content_path,))
+
+
+def test_unchanged_records_reused(tmp_path):
+    loaded = []
+    registry = make_registry(loaded)
+    paths = [make_package(tmp_path, 'b'), make_package(tmp_path, 'a')]
+
+    first = registry.refresh(paths)
+    assert [record.name for record in first] == ['b', 'a']
+    assert loaded == paths
+
+    second = registry.refresh(paths)
+    assert loaded == paths
+    assert all(old is new for old, new in zip(first, second, strict=True))
+
+
+def test_changed_file_reloaded(tmp_path):
+    loaded = []
+    registry = make_registry(loaded)
+    path = make_package(tmp_path, 'a')
+    first, = registry.refresh([path])
+
+    touch(path)
+    second, = registry.refresh([path])
+    assert second is not first
+    assert loaded == [path, path]
+
+
+def test_changed_dependency_reloaded(tmp_path):
+    loaded = []
+    registry = make_registry(loaded)
+    content_path = tmp_path / 'content'
+    content_path.mkdir()
+    path = make_package(tmp_path, 'a', str(content_path))
+    first, = registry.refresh([path])
+
+    (content_path / 'package.setup').write_text('{}')
+    touch(str(content_path))
+    second, = registry.refresh([path])
+    assert second is not first
+
+    # A dependency appearing later is a change too
+    missing_path = make_package(tmp_path, 'b', str(tmp_path / 'missing'))
+    first, = registry.refresh([missing_path])
+    (tmp_path / 'missing').mkdir()
+    second, = registry.refresh([missing_path])
+    assert second is not first
+
+
+def test_changes_notified(tmp_path):
+    registry = make_registry([])
+    notifications = []
+    registry.subscribe(notifications.append)
+    a_path = make_package(tmp_path, 'a')
+    b_path = make_package(tmp_path, 'b')
+
+    a, b = registry.refresh([a_path, b_path])
+    assert len(notifications) == 1
+    assert notifications[0].added == [a, b]
+
+    registry.refresh([a_path, b_path])
+    assert len(notifications) == 1  # Nothing has changed
+
+    touch(b_path)
+    new_b, = registry.refresh([b_path])
+    changes = notifications[1]
+    assert changes.added == []
+    assert changes.removed == [a]
+    assert changes.changed == [(b, new_b)]
+    assert changes.records == registry.records() == (new_b,)
+
+    registry.unsubscribe(notifications.append)
+    registry.refresh([])
+    assert len(notifications) == 2
+
+
+def test_invalidate(tmp_path):
+    loaded = []
+    registry = make_registry(loaded)
+    a_path = make_package(tmp_path, 'a')
+    b_path = make_package(tmp_path, 'b')
+    registry.refresh([a_path, b_path])
+
+    registry.invalidate(a_path)
+    registry.refresh([a_path, b_path])
+    assert loaded == [a_path, b_path, a_path]
+
+    registry.invalidate()
+    registry.refresh([a_path, b_path])
+    assert loaded == [a_path, b_path, a_path, a_path, b_path]
+    assert len(registry.records()) == 2
+
+
+def test_failed_load_retried(tmp_path):
+    loaded = []
+    registry = make_registry(loaded)
+    path = tmp_path / 'broken.json'
+    path.write_text('{')
+
+    assert registry.refresh([str(path)]) == ()
+    assert registry.refresh([str(path)]) == ()
+    assert loaded == [str(path), str(path)]
+
+    path.write_text(json.dumps({'name': 'fixed', 'content_path': str(tmp_path)}))
+    record, = registry.refresh([str(path)])
+    assert record.name == 'fixed'
+
+
+def test_parallel_refresh_keeps_order(tmp_path):
+    loaded = []
+    registry = make_registry(loaded)
+    paths = [make_package(tmp_path, f'package_{index}') for index in range(50)]
+
+    records = registry.refresh(paths, max_workers=8)
+    assert [record.path for record in records] == paths
+    assert sorted(loaded) == sorted(paths)
+
+    touch(paths[10])
+    notifications = []
+    registry.subscribe(notifications.append)
+    new_records = registry.refresh(paths, max_workers=8)
+    assert [record.path for record in new_records] == paths
+    assert notifications[0].changed == [(records[10], new_records[10])]
+    assert len(loaded) == 51
+
+
+def test_subscribe_returns_records(tmp_path):
+    registry = make_registry([])
+    a = registry.refresh([make_package(tmp_path, 'a')])
+    notifications = []
+    assert registry.subscribe(notifications.append) == a
+    assert notifications == []
+
+
+def apply_rows(rows, operations):
+    rows = list(rows)
+    for operation, row, record in operations:
+        if operation == 'remove':
+            del rows[row]
+        elif operation == 'replace':
+            rows[row] = record
+        else:
+            rows.insert(row, record)
+    return rows
+
+
+def test_row_changes(tmp_path):
+    registry = make_registry([])
+    paths = {name: make_package(tmp_path, name) for name in ('a', 'b', 'c', 'd', 'e')}
+    rows = list(registry.subscribe(lambda changes: None))
+    notifications = []
+    registry.subscribe(notifications.append)
+
+    records = registry.refresh([paths['b'], paths['d']])
+    operations = row_changes(rows, notifications[-1])
+    assert operations == [('insert', 0, records[0]), ('insert', 1, records[1])]
+    rows = apply_rows(rows, operations)
+
+    touch(paths['d'])
+    records = registry.refresh([paths['a'], paths['c'], paths['d'], paths['e']])
+    operations = row_changes(rows, notifications[-1])
+    assert [(operation, row) for operation, row, _ in operations] == [
+        ('remove', 0),  # b
+        ('replace', 0),  # d
+        ('insert', 0),  # a
+        ('insert', 1),  # c
+        ('insert', 3),  # e
+    ]
+    rows = apply_rows(rows, operations)
+    assert all(row is record for row, record in zip(rows, records, strict=True))
@@ -0,0 +1,112 @@
+import os
+from collections.abc import Iterable
+from functools import partial
+
+from PySide2.QtCore import QFileSystemWatcher
+from PySide2.QtCore import QObject
+from PySide2.QtCore import Qt
+from PySide2.QtCore import QTimer
+from PySide2.QtCore import Signal
+
+from package_manager.local_package import LocalPackage
+from package_manager.local_package import find_installed_packages
+from package_manager.local_package import package_registry
+from package_manager.local_package import package_roots
+from package_manager.package_registry import RegistryChanges
+
+
+# Watches the package folders, the package files and the files the packages are read from.
+# Changes on disk trigger a refresh of the installed package registry, which reports
+# the added, removed and changed packages. Refreshes made elsewhere are reported as well.
+# Changes are only reported while watching: start() reports the current packages first,
+# then every change to apply to them in order.
+class PackageWatcher(QObject):
+    # Signals
+    packages_reset = Signal(tuple)
+    packages_changed = Signal(RegistryChanges)
+    _registry_changed = Signal(int, RegistryChanges)
+
+    # File events come in bursts while packages are installed or edited, in milliseconds
+    REFRESH_DELAY = 250
+
+    def __init__(self, parent: QObject | None = None) -> None:
+        super(PackageWatcher, self).__init__(parent)
+
+        self.__watcher = QFileSystemWatcher(self)
+        self.__watcher.fileChanged.connect(self._on_path_changed)
+        self.__watcher.directoryChanged.connect(self._on_path_changed)
+
+        self.__refresh_timer = QTimer(self)
+        self.__refresh_timer.setSingleShot(True)
+        self.__refresh_timer.setInterval(self.REFRESH_DELAY)
+        self.__refresh_timer.timeout.connect(self.refresh)
+
+        # Queued, so the changes keep their order whatever thread refreshed the registry
+        self._registry_changed.connect(self._on_registry_changed, Qt.QueuedConnection)
+
+        # Changes queued before stop() must not be applied after the next start()
+        self.__subscription = 0
+        self.__listener = None
+        self.__unsubscribe = None
+
+    def is_watching(self) -> bool:
+        return self.__listener is not None
+
+    def start(self) -> None:
+        if self.is_watching():
+            return
+        self.__subscription += 1
+        self.__listener = partial(self._on_registry_notified, self.__subscription)
+        packages = package_registry().subscribe(self.__listener)
+        self.__unsubscribe = partial(package_registry().unsubscribe, self.__listener)
+        self.destroyed.connect(self.__unsubscribe)
+        self.watch(packages)
+        self.packages_reset.emit(packages)
+        self.__refresh_timer.start()  # Catches up with the changes made on disk while not watching
+
+    def refresh(self) -> None:
+        # The registry reports the changes
+        find_installed_packages()
+
+    def stop(self) -> None:
+        if not self.is_watching():
+            return
+        self.destroyed.disconnect(self.__unsubscribe)
+        self.__unsubscribe()
+        self.__listener = None
+        self.__unsubscribe = None
+        self.__refresh_timer.stop()
+        watched_paths = self.__watcher.files() + self.__watcher.directories()
+        if watched_paths:
+            self.__watcher.removePaths(watched_paths)
+
+    def watch(self, packages: Iterable[LocalPackage]) -> None:
+        paths = set(package_roots())
+        for package in packages:
+            paths.add(package.package_file)
+            paths.update(package.dependencies())
+        paths = {os.path.normpath(path).replace('\\', '/') for path in paths if os.path.exists(path)}
+
+        watched_paths = set(self.__watcher.files() + self.__watcher.directories())
+        unwatched_paths = watched_paths - paths
+        if unwatched_paths:
+            self.__watcher.removePaths(list(unwatched_paths))
+        new_paths = paths - watched_paths
+        if new_paths:
+            self.__watcher.addPaths(list(new_paths))
+
+    def _on_registry_notified(self, subscription: int, changes: RegistryChanges) -> None:
+        # Called by the registry from the thread that refreshed it
+        try:
+            self._registry_changed.emit(subscription, changes)
+        except RuntimeError:  # Being deleted, unsubscribed when destroyed
+            pass
+
+    def _on_path_changed(self, path: str) -> None:
+        # Replaced files stop being watched, they are watched again after the refresh
+        self.__refresh_timer.start()
+
+    def _on_registry_changed(self, subscription: int, changes: RegistryChanges) -> None:
+        if self.is_watching() and subscription == self.__subscription:
+            self.watch(changes.records)
+            self.packages_changed.emit(changes)
@@ -0,0 +1,88 @@
+import math
+from collections.abc import Callable
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from urllib.parse import parse_qsl
+from urllib.parse import urlencode
+from urllib.parse import urlsplit
+from urllib.parse import urlunsplit
+
+
+# Returns page items and the parsed Link header
+GetPage = Callable[[str], tuple[list, dict[str, str]]]
+
+
+def parse_link_header(value: str | None) -> dict[str, str]:
+    # '<https://...?page=2>; rel="next", <https://...?page=5>; rel="last"' -> {'next': ..., 'last': ...}
+    links = {}
+    if not value:
+        return links
+    for part in value.split(','):
+        url, *params = part.split(';')
+        url = url.strip().strip('<>')
+        for param in params:
+            name, _, rels = param.strip().partition('=')
+            if name.strip() == 'rel':
+                for rel in rels.strip('"').split():
+                    links[rel] = url
+    return links
+
+
+def with_query(url: str, **params: Any) -> str:
+    scheme, netloc, path, query, fragment = urlsplit(url)
+    query_data = dict(parse_qsl(query))
+    query_data.update({name: str(value) for name, value in params.items()})
+    return urlunsplit((scheme, netloc, path, urlencode(query_data), fragment))
+
+
+def page_number(url: str) -> int | None:
+    page = dict(parse_qsl(urlsplit(url).query)).get('page')
+    return int(page) if page and page.isdigit() else None
+
+
+def iter_pages(
+        get_page: GetPage,
+        url: str,
+        per_page: int = 100,
+        max_items: int | None = None,
+        max_workers: int = 4,
+) -> Iterator[Any]:
+    # Stops as soon as a page is incomplete or there is no next page.
+    # When the number of pages is known from the "last" link, the remaining pages are fetched in parallel.
+    count = 0
+    items, links = get_page(with_query(url, per_page=per_page))
+    for item in items:
+        if max_items is not None and count >= max_items:
+            return
+        count += 1
+        yield item
+
+    if len(items) < per_page or 'next' not in links:
+        return
+
+    last_page = page_number(links['last']) if 'last' in links else None
+    if last_page is not None:
+        if max_items is not None:
+            last_page = min(last_page, math.ceil(max_items / per_page))
+        page_urls = [with_query(url, per_page=per_page, page=page) for page in range(2, last_page + 1)]
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='package_manager') as executor:
+            for items, _ in executor.map(get_page, page_urls):
+                for item in items:
+                    if max_items is not None and count >= max_items:
+                        return
+                    count += 1
+                    yield item
+        return
+
+    next_url = links['next']
+    while next_url:
+        items, links = get_page(next_url)
+        for item in items:
+            if max_items is not None and count >= max_items:
+                return
+            count += 1
+            yield item
+        if len(items) < per_page:
+            return
+        next_url = links.get('next')
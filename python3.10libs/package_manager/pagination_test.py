@@ -0,0 +1,56 @@
+from package_manager.pagination import iter_pages
+from package_manager.pagination import page_number
+from package_manager.pagination import parse_link_header
+from package_manager.pagination import with_query
+
+
+URL = 'https://api.github.com/repos/owner/repo/releases'
+
+
+class FakeAPI:
+    def __init__(self, total: int, with_last: bool = True) -> None:
+        self.total = total
+        self.with_last = with_last
+        self.requested = []
+
+    def get_page(self, url: str) -> tuple[list, dict[str, str]]:
+        self.requested.append(page_number(url) or 1)
+        per_page = int(url.split('per_page=')[1].split('&')[0])
+        page = page_number(url) or 1
+        last_page = max(1, -(-self.total // per_page))
+        items = list(range((page - 1) * per_page, min(page * per_page, self.total)))
+        links = []
+        if page < last_page:
+            links.append(f'<{with_query(URL, per_page=per_page, page=page + 1)}>; rel="next"')
+            if self.with_last:
+                links.append(f'<{with_query(URL, per_page=per_page, page=last_page)}>; rel="last"')
+        return items, parse_link_header(', '.join(links))
+
+
+def test_parse_link_header():
+    links = parse_link_header(f'<{URL}?page=2>; rel="next", <{URL}?page=5>; rel="last"')
+    assert links == {'next': URL + '?page=2', 'last': URL + '?page=5'}
+    assert page_number(links['last']) == 5
+    assert parse_link_header(None) == {}
+
+
+def test_single_incomplete_page():
+    api = FakeAPI(12)
+    assert list(iter_pages(api.get_page, URL, per_page=100)) == list(range(12))
+    assert api.requested == [1]
+
+
+def test_all_pages_in_order():
+    api = FakeAPI(250)
+    assert list(iter_pages(api.get_page, URL, per_page=30)) == list(range(250))
+    assert sorted(api.requested) == list(range(1, 10))
+
+    api = FakeAPI(250, with_last=False)
+    assert list(iter_pages(api.get_page, URL, per_page=30)) == list(range(250))
+    assert api.requested == list(range(1, 10))
+
+
+def test_max_items_limits_requests():
+    api = FakeAPI(1000)
+    assert list(iter_pages(api.get_page, URL, per_page=30, max_items=90)) == list(range(90))
+    assert sorted(api.requested) == [1, 2, 3]
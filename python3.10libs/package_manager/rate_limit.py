@@ -0,0 +1,100 @@
+import threading
+from collections.abc import Callable
+from collections.abc import Iterator
+from collections.abc import Mapping
+from contextlib import contextmanager
+from time import time
+
+from package_manager.task_pool import DeferredError
+
+
+# Request priorities
+INTERACTIVE = 0  # The user is waiting for the result
+BACKGROUND = 1  # Update checks and prefetching
+
+# Requests kept for interactive use when the quota runs low
+RESERVE = 100
+
+_local = threading.local()
+
+
+class QuotaExhaustedError(DeferredError):
+    def __init__(self, reset_at: float = 0.0) -> None:
+        super(QuotaExhaustedError, self).__init__(f'API rate limit exceeded until {reset_at:.0f}')
+        self.reset_at = reset_at
+
+
+def current_priority() -> int:
+    return getattr(_local, 'priority', INTERACTIVE)
+
+
+@contextmanager
+def priority(level: int) -> Iterator[None]:
+    # Applies to the requests made by the current thread
+    previous_level = current_priority()
+    _local.priority = level
+    try:
+        yield
+    finally:
+        _local.priority = previous_level
+
+
+class RateLimiter:
+    # Tracks the quota of one API resource from the X-RateLimit-* response headers.
+    # Background requests stop at `reserve` remaining requests, interactive ones at zero.
+    # Both are refused until the reset time once the quota is exhausted.
+    def __init__(self, reserve: int = RESERVE, clock: Callable[[], float] = time) -> None:
+        self.reserve = reserve
+        self.clock = clock
+
+        self.limit: int | None = None
+        self.remaining: int | None = None  # Unknown until the first response
+        self.reset_at = 0.0
+
+        self._lock = threading.Lock()
+
+    def update(self, headers: Mapping[str, str], status_code: int = 200) -> None:
+        with self._lock:
+            retry_after = headers.get('Retry-After')
+            if retry_after is not None and status_code in (403, 429):  # Secondary rate limit
+                self.remaining = 0
+                self.reset_at = max(self.reset_at, self.clock() + float(retry_after))
+                return
+
+            remaining = headers.get('X-RateLimit-Remaining')
+            reset_at = headers.get('X-RateLimit-Reset')
+            if remaining is None or reset_at is None:
+                return
+            remaining = int(remaining)
+            reset_at = float(reset_at)
+            if headers.get('X-RateLimit-Limit') is not None:
+                self.limit = int(headers['X-RateLimit-Limit'])
+            if reset_at != self.reset_at or self.remaining is None:
+                self.remaining = remaining
+                self.reset_at = reset_at
+            else:  # Responses of concurrent requests may arrive out of order
+                self.remaining = min(self.remaining, remaining)
+
+    def allows(self, level: int = INTERACTIVE) -> bool:
+        with self._lock:
+            return self._allows(level)
+
+    def _allows(self, level: int) -> bool:
+        if self.remaining is None or self.clock() >= self.reset_at:
+            return True
+        if level == INTERACTIVE:
+            return self.remaining > 0
+        return self.remaining > self.reserve
+
+    def acquire(self, level: int = INTERACTIVE) -> bool:
+        # Counts the request in advance, so concurrent requests do not overshoot the quota
+        with self._lock:
+            if not self._allows(level):
+                return False
+            if self.remaining is not None and self.clock() < self.reset_at:
+                self.remaining -= 1
+            return True
+
+    def reset_in(self) -> float:
+        with self._lock:
+            return max(0.0, self.reset_at - self.clock())
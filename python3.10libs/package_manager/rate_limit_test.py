@@ -0,0 +1,86 @@
+import threading
+
+from package_manager.rate_limit import BACKGROUND
+from package_manager.rate_limit import INTERACTIVE
+from package_manager.rate_limit import QuotaExhaustedError
+from package_manager.rate_limit import RateLimiter
+from package_manager.rate_limit import current_priority
+from package_manager.rate_limit import priority
+from package_manager.task_pool import run_tasks
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def headers(remaining: int, reset_at: float = 2000) -> dict:
+    return {'X-RateLimit-Limit': '5000', 'X-RateLimit-Remaining': str(remaining), 'X-RateLimit-Reset': str(reset_at)}
+
+
+def test_unknown_quota():
+    limiter = RateLimiter()
+    assert limiter.acquire(BACKGROUND)
+    assert limiter.remaining is None
+
+
+def test_background_keeps_reserve():
+    limiter = RateLimiter(reserve=2, clock=Clock())
+    limiter.update(headers(4))
+    assert limiter.acquire(BACKGROUND)
+    assert limiter.acquire(BACKGROUND)
+    assert not limiter.acquire(BACKGROUND)
+    assert limiter.acquire(INTERACTIVE)
+    assert limiter.acquire(INTERACTIVE)
+    assert not limiter.acquire(INTERACTIVE)
+    assert limiter.limit == 5000
+
+
+def test_deferred_until_reset():
+    clock = Clock()
+    limiter = RateLimiter(clock=clock)
+    limiter.update(headers(0))
+    assert not limiter.allows(INTERACTIVE)
+    assert limiter.reset_in() == 1000
+    clock.now = 2000
+    assert limiter.acquire(BACKGROUND)
+
+
+def test_out_of_order_responses():
+    limiter = RateLimiter(clock=Clock())
+    limiter.update(headers(10))
+    limiter.update(headers(12))
+    assert limiter.remaining == 10
+    limiter.update(headers(4999, reset_at=5600))
+    assert limiter.remaining == 4999
+
+
+def test_secondary_rate_limit():
+    clock = Clock()
+    limiter = RateLimiter(clock=clock)
+    limiter.update({'Retry-After': '60'}, 403)
+    assert not limiter.allows(INTERACTIVE)
+    clock.now += 60
+    assert limiter.allows(BACKGROUND)
+
+
+def test_priority_is_per_thread():
+    seen = []
+    with priority(BACKGROUND):
+        thread = threading.Thread(target=lambda: seen.append(current_priority()))
+        thread.start()
+        thread.join()
+        assert current_priority() == BACKGROUND
+    assert current_priority() == INTERACTIVE
+    assert seen == [INTERACTIVE]
+
+
+def test_exhausted_quota_defers_task():
+    def task():
+        raise QuotaExhaustedError(2000)
+
+    result, = run_tasks([('github', task)])
+    assert result.deferred
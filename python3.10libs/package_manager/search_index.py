@@ -0,0 +1,89 @@
+import re
+from bisect import bisect_left
+from collections.abc import Mapping
+from collections.abc import Sequence
+
+
+# Letters and digits, underscores and punctuation split words
+WORD_PATTERN = re.compile(r'[^\W_]+')
+
+
+def tokenize(text: str | None) -> list[str]:
+    if not text:
+        return []
+    return WORD_PATTERN.findall(text.lower())
+
+
+# Inverted index: every word of every field points to the documents containing it.
+# A query matches the documents containing all of its terms, every term being the prefix of a word,
+# so results stay complete while the user is typing. "field:term" limits a term to a single field.
+class SearchIndex:
+    def __init__(self, fields: Sequence[str]) -> None:
+        self.fields = tuple(fields)
+        self.count = 0
+
+        self._words: dict[str, set[int]] = {}
+        self._field_words: dict[str, set[int]] = {}  # "field:word" keys
+        self._sorted_words: list[str] | None = None
+        self._sorted_field_words: list[str] | None = None
+        self._prefix_cache: dict[str, frozenset[int]] = {}
+
+    def add(self, values: Mapping[str, str | None]) -> int:
+        document = self.count
+        self.count += 1
+        for field in self.fields:
+            for word in tokenize(values.get(field)):
+                self._words.setdefault(word, set()).add(document)
+                self._field_words.setdefault(f'{field}:{word}', set()).add(document)
+        self._sorted_words = None
+        self._sorted_field_words = None
+        self._prefix_cache.clear()
+        return document
+
+    def terms(self, query: str) -> list[str]:
+        terms = []
+        for chunk in query.split():
+            field, separator, value = chunk.partition(':')
+            if separator and field.lower() in self.fields:
+                terms.extend(f'{field.lower()}:{word}' for word in tokenize(value))
+            else:
+                terms.extend(tokenize(chunk))
+        return terms
+
+    def _documents(self, term: str) -> frozenset[int]:
+        # Documents containing a word starting with the term
+        documents = self._prefix_cache.get(term)
+        if documents is not None:
+            return documents
+
+        if ':' in term:
+            if self._sorted_field_words is None:
+                self._sorted_field_words = sorted(self._field_words)
+            words, postings = self._sorted_field_words, self._field_words
+        else:
+            if self._sorted_words is None:
+                self._sorted_words = sorted(self._words)
+            words, postings = self._sorted_words, self._words
+
+        matching = set()
+        for position in range(bisect_left(words, term), len(words)):
+            word = words[position]
+            if not word.startswith(term):
+                break
+            matching.update(postings[word])
+        documents = self._prefix_cache[term] = frozenset(matching)
+        return documents
+
+    def search(self, query: str) -> frozenset[int] | None:
+        # None means the query has no terms and everything matches
+        terms = self.terms(query)
+        if not terms:
+            return None
+        # Longer terms usually match fewer documents, intersecting them first is cheaper
+        result = None
+        for term in sorted(set(terms), key=len, reverse=True):
+            documents = self._documents(term)
+            result = documents if result is None else result & documents
+            if not result:
+                break
+        return result
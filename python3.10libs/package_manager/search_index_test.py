@@ -0,0 +1,54 @@
+from package_manager.search_index import SearchIndex
+from package_manager.search_index import tokenize
+
+
+FIELDS = ('name', 'description', 'author', 'status', 'license')
+
+
+def make_index() -> SearchIndex:
+    index = SearchIndex(FIELDS)
+    index.add({'name': 'Houdini_Package_Manager', 'description': 'Installs packages', 'author': 'Ivan Titov',
+               'status': 'stable', 'license': 'commercial'})
+    index.add({'name': 'qLib', 'description': 'Library of digital assets', 'author': 'qLab',
+               'status': 'stable', 'license': None})
+    index.add({'name': 'MOPs', 'description': 'Motion operators', 'author': 'Henry Foster',
+               'status': 'beta', 'license': 'indie'})
+    return index
+
+
+def test_tokenize():
+    assert tokenize('Houdini_Package-Manager v2.0') == ['houdini', 'package', 'manager', 'v2', '0']
+    assert tokenize(None) == []
+
+
+def test_prefix_search():
+    index = make_index()
+    assert index.search('') is None
+    assert index.search('  ') is None
+    assert index.search('pack') == {0}
+    assert index.search('PACKAGE_man') == {0}
+    assert index.search('q') == {1}
+    assert index.search('oper') == {2}
+    assert index.search('li') == {1}
+    assert index.search('lib digital') == {1}
+    assert index.search('lib motion') == frozenset()
+    assert index.search('missing') == frozenset()
+
+
+def test_field_search():
+    index = make_index()
+    assert index.search('status:stable') == {0, 1}
+    assert index.search('status:be') == {2}
+    assert index.search('license:indie') == {2}
+    assert index.search('status:stable lib') == {1}
+    assert index.search('status') == frozenset()  # Field names are not words
+    assert index.search('motion:operators') == {2}  # Not a field, searched as words
+
+
+def test_add_after_search():
+    index = make_index()
+    assert index.search('pyro') == frozenset()
+    document = index.add({'name': 'Pyro Tools', 'status': 'alpha'})
+    assert document == 3
+    assert index.search('pyro') == {3}
+    assert index.count == 4
@@ -1,9 +1,16 @@
+from PySide2.QtGui import QShowEvent
 from PySide2.QtWidgets import QCheckBox
+from PySide2.QtWidgets import QFormLayout
+from PySide2.QtWidgets import QGroupBox
+from PySide2.QtWidgets import QLabel
+from PySide2.QtWidgets import QPushButton
 from PySide2.QtWidgets import QSizePolicy
+from PySide2.QtWidgets import QSpinBox
 from PySide2.QtWidgets import QSpacerItem
 from PySide2.QtWidgets import QVBoxLayout
 from PySide2.QtWidgets import QWidget
 
+from package_manager import github
 from package_manager.update_options import UpdateOptions
 
 
@@ -21,6 +28,77 @@ class SettingsWidget(QWidget):
         self.check_on_startup_toggle.toggled.connect(UpdateOptions().set_check_on_startup)
         main_layout.addWidget(self.check_on_startup_toggle)
 
+        # GitHub API Cache
+        cache_group = QGroupBox('GitHub API Cache')
+        main_layout.addWidget(cache_group)
+
+        cache_layout = QFormLayout(cache_group)
+        cache_layout.setContentsMargins(6, 8, 6, 8)
+        cache_layout.setSpacing(4)
+        cache_layout.setHorizontalSpacing(8)
+
+        self.cache_max_entries_field = QSpinBox()
+        self.cache_max_entries_field.setRange(100, 100000)
+        self.cache_max_entries_field.setSingleStep(100)
+        self.cache_max_entries_field.editingFinished.connect(self._on_cache_limits_changed)
+        cache_layout.addRow('Max Entries', self.cache_max_entries_field)
+
+        self.cache_max_size_field = QSpinBox()
+        self.cache_max_size_field.setRange(1, 4096)
+        self.cache_max_size_field.setSuffix(' MB')
+        self.cache_max_size_field.editingFinished.connect(self._on_cache_limits_changed)
+        cache_layout.addRow('Max Size', self.cache_max_size_field)
+
+        self.cache_usage_info = QLabel()
+        cache_layout.addRow('Usage', self.cache_usage_info)
+
+        self.cache_stats_info = QLabel()
+        self.cache_stats_info.setWordWrap(True)
+        cache_layout.addRow('Statistics', self.cache_stats_info)
+
+        clear_cache_button = QPushButton('Clear Cache')
+        clear_cache_button.clicked.connect(self._on_clear_cache)
+        cache_layout.addRow(clear_cache_button)
+
+        # Release Archive Cache
+        archive_cache_group = QGroupBox('Release Archive Cache')
+        main_layout.addWidget(archive_cache_group)
+
+        archive_cache_layout = QFormLayout(archive_cache_group)
+        archive_cache_layout.setContentsMargins(6, 8, 6, 8)
+        archive_cache_layout.setSpacing(4)
+        archive_cache_layout.setHorizontalSpacing(8)
+
+        self.archive_cache_max_size_field = QSpinBox()
+        self.archive_cache_max_size_field.setRange(64, 65536)
+        self.archive_cache_max_size_field.setSingleStep(256)
+        self.archive_cache_max_size_field.setSuffix(' MB')
+        self.archive_cache_max_size_field.editingFinished.connect(self._on_archive_cache_limits_changed)
+        archive_cache_layout.addRow('Max Size', self.archive_cache_max_size_field)
+
+        self.archive_cache_usage_info = QLabel()
+        archive_cache_layout.addRow('Usage', self.archive_cache_usage_info)
+
+        clear_archive_cache_button = QPushButton('Clear Cache')
+        clear_archive_cache_button.clicked.connect(self._on_clear_archive_cache)
+        archive_cache_layout.addRow(clear_archive_cache_button)
+
+        # Installed Packages
+        discovery_group = QGroupBox('Installed Packages')
+        main_layout.addWidget(discovery_group)
+
+        discovery_layout = QFormLayout(discovery_group)
+        discovery_layout.setContentsMargins(6, 8, 6, 8)
+        discovery_layout.setSpacing(4)
+        discovery_layout.setHorizontalSpacing(8)
+
+        self.discovery_workers_field = QSpinBox()
+        self.discovery_workers_field.setRange(1, 64)
+        self.discovery_workers_field.setToolTip('Threads used to find and read the installed packages.\n'
+                                                'More threads help when package folders are on network drives.')
+        self.discovery_workers_field.editingFinished.connect(self._on_discovery_workers_changed)
+        discovery_layout.addRow('Discovery Threads', self.discovery_workers_field)
+
         self.update_settings()
 
         spacer = QSpacerItem(0, 10, QSizePolicy.Ignored, QSizePolicy.Expanding)
@@ -52,3 +130,61 @@ class SettingsWidget(QWidget):
         self.check_on_startup_toggle.blockSignals(True)
         self.check_on_startup_toggle.setChecked(UpdateOptions().check_on_startup())
         self.check_on_startup_toggle.blockSignals(False)
+
+        self.cache_max_entries_field.blockSignals(True)
+        self.cache_max_entries_field.setValue(UpdateOptions().api_cache_max_entries())
+        self.cache_max_entries_field.blockSignals(False)
+
+        self.cache_max_size_field.blockSignals(True)
+        self.cache_max_size_field.setValue(UpdateOptions().api_cache_max_size())
+        self.cache_max_size_field.blockSignals(False)
+
+        self.archive_cache_max_size_field.blockSignals(True)
+        self.archive_cache_max_size_field.setValue(UpdateOptions().archive_cache_max_size())
+        self.archive_cache_max_size_field.blockSignals(False)
+
+        self.discovery_workers_field.blockSignals(True)
+        self.discovery_workers_field.setValue(UpdateOptions().discovery_workers())
+        self.discovery_workers_field.blockSignals(False)
+
+        self.update_cache_info()
+
+    def update_cache_info(self) -> None:
+        entries, size = github.API.cache_size()
+        self.cache_usage_info.setText(f'{entries} entries, {size / 1024 / 1024:.1f} MB')
+        stats = github.API.cache_stats()
+        self.cache_stats_info.setText(f'{stats.hits} hits, {stats.misses} misses, '
+                                      f'{stats.expired} expired, {stats.evicted} evicted this session')
+        archives, archives_size = github.archive_cache().size()
+        self.archive_cache_usage_info.setText(f'{archives} archives, {archives_size / 1024 / 1024:.1f} MB')
+
+    def showEvent(self, event: QShowEvent) -> None:
+        self.update_cache_info()
+        super(SettingsWidget, self).showEvent(event)
+
+    def _on_cache_limits_changed(self) -> None:
+        max_entries = self.cache_max_entries_field.value()
+        max_size = self.cache_max_size_field.value()
+        UpdateOptions().set_api_cache_max_entries(max_entries)
+        UpdateOptions().set_api_cache_max_size(max_size)
+        github.API.set_cache_limits(max_entries, max_size * 1024 * 1024)
+        self.update_cache_info()
+
+    def _on_clear_cache(self) -> None:
+        github.API.clear()
+        self.update_cache_info()
+
+    def _on_archive_cache_limits_changed(self) -> None:
+        max_size = self.archive_cache_max_size_field.value()
+        UpdateOptions().set_archive_cache_max_size(max_size)
+        cache = github.archive_cache()
+        cache.max_bytes = max_size * 1024 * 1024
+        cache.evict()
+        self.update_cache_info()
+
+    def _on_clear_archive_cache(self) -> None:
+        github.archive_cache().clear()
+        self.update_cache_info()
+
+    def _on_discovery_workers_changed(self) -> None:
+        UpdateOptions().set_discovery_workers(self.discovery_workers_field.value())
@@ -1,51 +1,96 @@
 import os
-from operator import itemgetter
+from collections.abc import Iterable
 
 from package_manager.package import package_score
 
 
+# Folders never holding package roots or digital assets, they are not walked into
+PRUNED_FOLDERS = frozenset(('backup', '.git', '.svn', '.hg', 'node_modules', '__pycache__',
+                            'tex', 'texture', 'textures'))
+HDA_EXTENSIONS = ('.otl', '.otlnc', '.otllc', '.hda', '.hdanc', '.hdalc')
+
+
+class FolderInfo:
+    __slots__ = 'path', 'score', 'has_hdas'
+
+    def __init__(self, path: str, score: int, has_hdas: bool) -> None:
+        self.path = path
+        self.score = score
+        self.has_hdas = has_hdas
+
+
+def scan_folders(path: str) -> list[FolderInfo]:
+    # Lists every folder once, in the order of os.walk. Symbolic links to folders are not followed.
+    folders = []
+    stack = [path]
+    while stack:
+        folder_path = stack.pop()
+        try:
+            with os.scandir(folder_path) as iterator:
+                entries = list(iterator)
+        except OSError:
+            continue
+        names = set()
+        subfolder_paths = []
+        has_hdas = False
+        for entry in entries:
+            names.add(entry.name)
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if is_dir:
+                if entry.name.lower() not in PRUNED_FOLDERS and not entry.is_symlink():
+                    subfolder_paths.append(entry.path)
+            elif not has_hdas and entry.name.endswith(HDA_EXTENSIONS):
+                has_hdas = True
+        folders.append(FolderInfo(folder_path, package_score(names), has_hdas))
+        stack.extend(reversed(subfolder_paths))
+    return folders
+
+
 def dir_package_score(path: str) -> int:
     return package_score(os.listdir(path))
 
 
-def find_package_root_path(path: str) -> str:
-    paths = []
-    scores = []
-    for root, folders, files in os.walk(path):
-        score = dir_package_score(root)
-        if score > 0:
-            paths.append(root)
-            scores.append(score)
-    if not paths:
+def best_package_root(folders: Iterable[FolderInfo]) -> FolderInfo:
+    # The last one of the best scored folders
+    best_folder = None
+    for folder in folders:
+        if folder.score > 0 and (best_folder is None or folder.score >= best_folder.score):
+            best_folder = folder
+    if best_folder is None:
         raise FileNotFoundError('No package found')
-    return sorted(zip(paths, scores, strict=False), key=itemgetter(1))[-1][0]
+    return best_folder
 
 
-def find_digital_assets_roots(package_root_path: str) -> tuple[str, ...]:
-    paths = []
-    for root, folders, files in os.walk(package_root_path):
-        if root.lower() == os.path.join(package_root_path, 'otls').lower():
-            continue
+def find_package_root_path(path: str) -> str:
+    return best_package_root(scan_folders(path)).path
 
-        if os.path.basename(root) == 'backup':
-            continue
 
-        for file in files:
-            if file.endswith(('.otl', '.otlnc', '.otllc',
-                              '.hda', '.hdanc', '.hdalc')):
-                paths.append(root)
-                break
-    return tuple(paths)
+def digital_assets_roots(folders: Iterable[FolderInfo], package_root_path: str) -> tuple[str, ...]:
+    prefix = os.path.join(package_root_path, '')
+    otls_path = os.path.join(package_root_path, 'otls').lower()  # Loaded by Houdini itself
+    return tuple(folder.path for folder in folders
+                 if folder.has_hdas
+                 and (folder.path == package_root_path or folder.path.startswith(prefix))
+                 and folder.path.lower() != otls_path)
+
+
+def find_digital_assets_roots(package_root_path: str) -> tuple[str, ...]:
+    return digital_assets_roots(scan_folders(package_root_path), package_root_path)
 
 
 def make_setup_schema(path: str) -> dict:
+    # The tree is walked once for both the package root and the digital asset folders
+    folders = scan_folders(path)
     try:
-        package_root_path = find_package_root_path(path)
+        package_root_path = best_package_root(folders).path
     except FileNotFoundError:
         return None
     package_root = package_root_path.replace(path, '').strip('\\/').replace('\\', '/')
     hda_roots = map(lambda p: p.replace(package_root_path, '').strip('\\/').replace('\\', '/'),
-                    find_digital_assets_roots(package_root_path))
+                    digital_assets_roots(folders, package_root_path))
     schema = {
         'root': package_root,
         'hda_roots': tuple(hda_roots),
@@ -0,0 +1,55 @@
+import os
+
+from package_manager.setup_schema import find_digital_assets_roots
+from package_manager.setup_schema import find_package_root_path
+from package_manager.setup_schema import make_setup_schema
+from package_manager.setup_schema import scan_folders
+
+
+def make_tree(root, files):
+    for file in files:
+        file_path = root / file
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_text('')
+
+
+def test_package_root(tmp_path):
+    make_tree(tmp_path, (
+        'README.md',
+        'repo/otls/a.hda',
+        'repo/scripts/123.py',
+        'repo/toolbar/tools.shelf',
+        'repo/docs/otls/b.hda',
+    ))
+    assert find_package_root_path(str(tmp_path)) == str(tmp_path / 'repo')
+
+
+def test_setup_schema(tmp_path):
+    make_tree(tmp_path, (
+        'package/otls/a.hda',
+        'package/scripts/123.py',
+        'package/hda/sop/b.hdanc',
+        'package/hda/lop/c.otl',
+        'package/hda/lop/backup/c_bak1.otl',
+        'package/backup/d.hda',
+        'package/.git/objects/e.hda',
+        'package/textures/wood.hda',
+    ))
+    schema = make_setup_schema(str(tmp_path))
+    assert schema['root'] == 'package'
+    assert sorted(schema['hda_roots']) == ['hda/lop', 'hda/sop']  # Directory listing order
+    assert sorted(find_digital_assets_roots(str(tmp_path / 'package'))) == [
+        str(tmp_path / 'package' / 'hda' / 'lop'),
+        str(tmp_path / 'package' / 'hda' / 'sop'),
+    ]
+
+
+def test_no_package(tmp_path):
+    make_tree(tmp_path, ('docs/index.html', 'node_modules/otls/a.hda', 'node_modules/scripts/b.py'))
+    assert make_setup_schema(str(tmp_path)) is None
+
+
+def test_walk_order(tmp_path):
+    make_tree(tmp_path, ('a/b/c/file', 'a/d/file', 'e/file'))
+    walked = [root for root, folders, files in os.walk(tmp_path)]
+    assert [folder.path for folder in scan_folders(str(tmp_path))] == walked
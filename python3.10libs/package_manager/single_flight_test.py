@@ -0,0 +1,62 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from package_manager.single_flight import SingleFlight
+
+
+def test_concurrent_calls_are_shared():
+    calls = []
+    flight = SingleFlight()
+    barrier = threading.Barrier(8)
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.2)
+        return {'name': 'repo'}
+
+    def call(_):
+        barrier.wait()
+        return flight.do('/repos/owner/repo', fetch)
+
+    with ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(call, range(8)))
+
+    assert len(calls) == 1
+    assert flight.shared == 7
+    assert all(result is results[0] for result in results)
+    assert flight.in_flight() == 0
+
+
+def test_different_keys_are_not_shared():
+    flight = SingleFlight()
+    assert flight.do('a', lambda: 1) == 1
+    assert flight.do('b', lambda: 2) == 2
+    assert flight.do('a', lambda: 3) == 3  # Finished calls are not reused
+    assert flight.shared == 0
+
+
+def test_error_is_shared():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+
+    def fail():
+        started.set()
+        release.wait()
+        raise OSError('Network error')
+
+    with ThreadPoolExecutor(2) as executor:
+        leader = executor.submit(flight.do, 'a', fail)
+        started.wait()
+        follower = executor.submit(flight.do, 'a', lambda: 'not called')
+        while not flight.shared:
+            time.sleep(0.01)
+        release.set()
+        with pytest.raises(OSError, match='Network error'):
+            leader.result()
+        with pytest.raises(OSError, match='Network error'):
+            follower.result()
+    assert flight.in_flight() == 0
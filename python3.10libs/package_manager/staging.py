@@ -0,0 +1,85 @@
+import os
+import shutil
+from collections.abc import Collection
+
+
+def staging_path(dst_path: str) -> str:
+    return os.path.normpath(dst_path) + '.staging'
+
+
+def backup_path(dst_path: str) -> str:
+    return os.path.normpath(dst_path) + '.previous'
+
+
+def discarded_path(dst_path: str) -> str:
+    return os.path.normpath(dst_path) + '.discarded'
+
+
+def link_or_copy(src_path: str, dst_path: str) -> None:
+    try:
+        os.link(src_path, dst_path)
+    except OSError:
+        shutil.copy2(src_path, dst_path)
+
+
+def prepare_staging(dst_path: str, copy: Collection[str] = ()) -> str:
+    # The staging folder is created next to dst_path, so the swap is a rename on the same drive.
+    # It is seeded with hard links to the installed files, so unchanged files cost nothing to keep.
+    # Files from `copy` are copied instead, they are going to be modified in place.
+    staging = staging_path(dst_path)
+    if os.path.exists(staging):  # Left by an interrupted update
+        shutil.rmtree(staging)
+    shutil.rmtree(discarded_path(dst_path), ignore_errors=True)  # Left by an interrupted rollback
+    if not os.path.isdir(dst_path):
+        os.makedirs(staging)
+        return staging
+
+    def seed(src_path: str, seed_path: str) -> None:
+        rel_path = os.path.relpath(src_path, dst_path).replace('\\', '/')
+        if rel_path in copy:
+            shutil.copy2(src_path, seed_path)
+        else:
+            link_or_copy(src_path, seed_path)
+
+    shutil.copytree(dst_path, staging, copy_function=seed, symlinks=True)
+    return staging
+
+
+def swap_in(staging: str, dst_path: str) -> None:
+    # The previous version is kept as "<dst_path>.previous" for rollback()
+    dst_path = os.path.normpath(dst_path)
+    backup = backup_path(dst_path)
+    if os.path.exists(backup):
+        shutil.rmtree(backup)
+    if os.path.exists(dst_path):
+        os.rename(dst_path, backup)
+    try:
+        os.rename(staging, dst_path)
+    except OSError:
+        if os.path.exists(backup):
+            os.rename(backup, dst_path)
+        raise
+
+
+def can_rollback(dst_path: str) -> bool:
+    return os.path.isdir(backup_path(dst_path))
+
+
+def rollback(dst_path: str) -> None:
+    dst_path = os.path.normpath(dst_path)
+    backup = backup_path(dst_path)
+    if not os.path.isdir(backup):
+        raise FileNotFoundError(f'No previous version of "{dst_path}"')
+    discarded = discarded_path(dst_path)
+    if os.path.exists(discarded):
+        shutil.rmtree(discarded)
+    if os.path.exists(dst_path):
+        os.rename(dst_path, discarded)
+    os.rename(backup, dst_path)
+    shutil.rmtree(discarded, ignore_errors=True)
+
+
+def remove_backups(dst_path: str) -> None:
+    # Removes the previous version and the leftovers of interrupted updates, rollback is no longer possible
+    for path in (backup_path(dst_path), staging_path(dst_path), discarded_path(dst_path)):
+        shutil.rmtree(path, ignore_errors=True)
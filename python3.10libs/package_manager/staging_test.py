@@ -0,0 +1,60 @@
+import os
+import zipfile
+
+from package_manager.staging import backup_path
+from package_manager.staging import prepare_staging
+from package_manager.staging import remove_backups
+from package_manager.staging import rollback
+from package_manager.staging import staging_path
+from package_manager.staging import swap_in
+from package_manager.zip_extract import extract_zip
+
+
+def test_staged_update_and_rollback(tmp_path):
+    dst = tmp_path / 'package'
+    dst.mkdir()
+    (dst / 'a.txt').write_text('old')
+    (dst / 'b.txt').write_text('same')
+    (dst / 'package.setup').write_text('{"version": "1"}')
+
+    archive_path = tmp_path / 'v2.zip'
+    with zipfile.ZipFile(archive_path, 'w') as file:
+        file.writestr('repo/a.txt', 'new')
+        file.writestr('repo/b.txt', 'same')
+
+    staging = prepare_staging(str(dst), copy=('package.setup',))
+    extract_zip(str(archive_path), staging, keep=('package.setup',))
+    (tmp_path / 'package.staging' / 'package.setup').write_text('{"version": "2"}')
+    assert (dst / 'a.txt').read_text() == 'old'  # Installed version is untouched until the swap
+
+    swap_in(staging, str(dst))
+    assert (dst / 'a.txt').read_text() == 'new'
+    assert (dst / 'package.setup').read_text() == '{"version": "2"}'
+    previous = tmp_path / 'package.previous'
+    assert str(previous) == backup_path(str(dst))
+    assert (previous / 'a.txt').read_text() == 'old'
+    assert (previous / 'package.setup').read_text() == '{"version": "1"}'
+
+    rollback(str(dst))
+    assert (dst / 'a.txt').read_text() == 'old'
+    assert not previous.exists()
+
+
+def test_leftovers_are_removed(tmp_path):
+    dst = tmp_path / 'package'
+    dst.mkdir()
+    (dst / 'a.txt').write_text('installed')
+    orphan = tmp_path / 'package.staging'
+    orphan.mkdir()
+    (orphan / 'half_extracted.txt').write_text('')
+    (tmp_path / 'package.discarded').mkdir()
+
+    staging = prepare_staging(str(dst))
+    assert staging == staging_path(str(dst))
+    assert sorted(os.listdir(staging)) == ['a.txt']
+    assert not (tmp_path / 'package.discarded').exists()
+
+    swap_in(staging, str(dst))
+    prepare_staging(str(dst))  # Interrupted update
+    remove_backups(str(dst))
+    assert sorted(os.listdir(tmp_path)) == ['package']
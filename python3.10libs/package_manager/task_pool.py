@@ -0,0 +1,68 @@
+import threading
+from collections.abc import Callable
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+from contextlib import nullcontext
+from time import monotonic
+from typing import Any
+
+
+class DeferredError(Exception):
+    pass
+
+
+class TaskResult:
+    __slots__ = 'value', 'error', 'deferred'
+
+    def __init__(self, value: Any = None, error: BaseException | None = None, deferred: bool = False) -> None:
+        self.value = value
+        self.error = error
+        self.deferred = deferred
+
+    def ok(self) -> bool:
+        return not self.deferred and self.error is None
+
+
+def run_tasks(
+        tasks: Sequence[tuple[str, Callable[[], Any]]],
+        max_workers: int = 8,
+        per_host_limit: int | None = 4,
+        time_budget: float | None = None,
+) -> tuple[TaskResult, ...]:
+    # Tasks are (host, callable) pairs. Results are returned in the order of the tasks.
+    # Tasks not finished within the time budget are marked as deferred and left to finish
+    # in the background, their results are dropped. No per-host limit when it is None.
+    if not tasks:
+        return ()
+
+    host_limits = {
+        host: nullcontext() if per_host_limit is None else threading.BoundedSemaphore(per_host_limit)
+        for host, _ in tasks
+    }
+    deadline = None if time_budget is None else monotonic() + time_budget
+
+    def run(host: str, task: Callable[[], Any]) -> Any:
+        with host_limits[host]:
+            if deadline is not None and monotonic() > deadline:
+                raise DeferredError
+            return task()
+
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='package_manager')
+    futures = [executor.submit(run, host, task) for host, task in tasks]
+    wait(futures, timeout=None if deadline is None else max(0.0, deadline - monotonic()))
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    results = []
+    for future in futures:
+        if not future.done() or future.cancelled():
+            results.append(TaskResult(deferred=True))
+            continue
+        error = future.exception()
+        if isinstance(error, DeferredError):
+            results.append(TaskResult(deferred=True))
+        elif error is not None:
+            results.append(TaskResult(error=error))
+        else:
+            results.append(TaskResult(future.result()))
+    return tuple(results)
@@ -0,0 +1,66 @@
+import threading
+from time import sleep
+
+from package_manager.task_pool import run_tasks
+
+
+def test_results_keep_task_order():
+    def task(value):
+        sleep(0.01 * (5 - value))
+        return value
+
+    results = run_tasks([('host', lambda v=v: task(v)) for v in range(5)])
+    assert [result.value for result in results] == [0, 1, 2, 3, 4]
+
+
+def test_errors_are_isolated():
+    def fail():
+        raise OSError
+
+    results = run_tasks([('host', fail), ('host', lambda: 1)])
+    assert isinstance(results[0].error, OSError)
+    assert results[1].ok()
+    assert results[1].value == 1
+
+
+def test_per_host_limit():
+    lock = threading.Lock()
+    running = {'a': 0, 'b': 0}
+    peak = {'a': 0, 'b': 0}
+
+    def task(host):
+        with lock:
+            running[host] += 1
+            peak[host] = max(peak[host], running[host])
+        sleep(0.02)
+        with lock:
+            running[host] -= 1
+
+    run_tasks([(host, lambda h=host: task(h)) for host in 'ab' * 6], max_workers=8, per_host_limit=2)
+    assert peak == {'a': 2, 'b': 2}
+
+
+def test_no_per_host_limit():
+    lock = threading.Lock()
+    running = []
+    peak = []
+
+    def task():
+        with lock:
+            running.append(None)
+            peak.append(len(running))
+        sleep(0.05)
+        with lock:
+            running.pop()
+
+    run_tasks([('host', task)] * 8, max_workers=8, per_host_limit=None)
+    assert max(peak) == 8
+
+
+def test_time_budget_defers_remaining_tasks():
+    results = run_tasks([('host', lambda: sleep(0.2))] * 4, max_workers=1, time_budget=0.05)
+    assert all(result.deferred for result in results)
+
+    results = run_tasks([('host', lambda: 1), ('host', lambda: sleep(0.2))], max_workers=2, time_budget=0.05)
+    assert results[0].value == 1
+    assert results[1].deferred
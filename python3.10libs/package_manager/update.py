@@ -1,12 +1,29 @@
+import logging
+from functools import partial
 from time import time
 
+from PySide2.QtCore import QObject
+from PySide2.QtCore import Qt
+from PySide2.QtCore import QThread
+from PySide2.QtCore import Signal
+
 from package_manager import github
+from package_manager import rate_limit
+from package_manager import staging
 from package_manager.local_package import find_installed_packages
 from package_manager.package import Package
+from package_manager.task_pool import DeferredError
+from package_manager.task_pool import run_tasks
 from package_manager.update_dialog import UpdateDialog
 from package_manager.update_options import UpdateOptions
 
 
+logger = logging.getLogger(__name__)
+
+MAX_WORKERS = 8
+TIME_BUDGET = 10  # Seconds, the rest of the checks is deferred to the next time
+
+
 def has_update(package: Package, only_stable: bool | None = None) -> bool:
     only_stable = only_stable or UpdateOptions().only_stable_for_package(package)
     if package.source_type == 'github':
@@ -14,13 +31,29 @@ def has_update(package: Package, only_stable: bool | None = None) -> bool:
     return False
 
 
+def has_update_in_background(package: Package) -> bool:
+    # Gives way to the requests made from the UI when the API quota runs low,
+    # the check is deferred until the next time when the quota is exhausted
+    with rate_limit.priority(rate_limit.BACKGROUND):
+        return has_update(package)
+
+
 def update_package(package: Package) -> None:
     only_stable = UpdateOptions().only_stable_for_package(package)
     if package.source_type == 'github':
         github.install_from_repo(package, update=True, only_stable=only_stable)
 
 
-def check_for_updates(ignore_options: bool = False) -> None:
+def can_rollback_package(package: Package) -> bool:
+    return staging.can_rollback(package.content_path)
+
+
+def rollback_package(package: Package) -> None:
+    # Restores the version replaced by the last update, it can't be rolled back again
+    staging.rollback(package.content_path)
+
+
+def packages_to_check(ignore_options: bool = False) -> list[Package]:
     packages = []
     for package in find_installed_packages():
         if not package.source or not package.source_type or not package.version:
@@ -32,8 +65,31 @@ def check_for_updates(ignore_options: bool = False) -> None:
         if not ignore_options and not UpdateOptions().check_on_startup_for_package(package):
             continue
 
-        if has_update(package):
-            packages.append(package)
+        packages.append(package)
+
+    # Checks deferred last time go first
+    deferred = set(UpdateOptions().deferred_update_checks())
+    packages.sort(key=lambda p: p.source not in deferred)
+    return packages
+
+
+def find_updates(
+        packages: list[Package],
+        time_budget: float | None = TIME_BUDGET,
+) -> tuple[list[Package], list[Package]]:
+    # Metadata of all GitHub repositories is fetched in a single batched request up front
+    with rate_limit.priority(rate_limit.BACKGROUND):
+        github.prefetch_repo_metadata(package.source for package in packages if package.source_type == 'github')
+    # All the checks of a source type go to the same API host, the pool size is the only limit
+    tasks = [(package.source_type, partial(has_update_in_background, package)) for package in packages]
+    results = run_tasks(tasks, MAX_WORKERS, None, time_budget)
+    updates = [package for package, result in zip(packages, results, strict=True) if result.ok() and result.value]
+    deferred = [package for package, result in zip(packages, results, strict=True) if result.deferred]
+    return updates, deferred
+
+
+def apply_update_check_results(packages: list[Package], deferred: list[Package]) -> None:
+    UpdateOptions().set_deferred_update_checks([package.source for package in deferred])
 
     if packages:
         dialog = UpdateDialog()
@@ -43,4 +99,56 @@ def check_for_updates(ignore_options: bool = False) -> None:
                 if package in checked:
                     update_package(package)
 
-    UpdateOptions().set_last_check_time(time())
+    if not deferred:
+        UpdateOptions().set_last_check_time(time())
+
+
+def check_for_updates(ignore_options: bool = False, time_budget: float | None = None) -> None:
+    # Requested by the user, so every package is checked however long it takes
+    apply_update_check_results(*find_updates(packages_to_check(ignore_options), time_budget))
+
+
+class UpdateCheckThread(QThread):
+    # Signals
+    checked = Signal(list, list)
+
+    def __init__(self, ignore_options: bool = False, parent: QObject | None = None) -> None:
+        super(UpdateCheckThread, self).__init__(parent)
+
+        self.ignore_options = ignore_options
+
+    def run(self) -> None:
+        try:
+            packages, deferred = find_updates(packages_to_check(self.ignore_options))
+        except (OSError, ValueError, DeferredError):  # Startup must not be affected by network or GitHub failures
+            packages, deferred = [], []
+        except Exception:
+            logger.exception('Update check failed')
+            packages, deferred = [], []
+        self.checked.emit(packages, deferred)
+
+
+class UpdateCheckService(QObject):
+    # Keeps running services alive until their results are shown
+    _running = set()
+
+    def __init__(self, ignore_options: bool = False, parent: QObject | None = None) -> None:
+        super(UpdateCheckService, self).__init__(parent)
+
+        self.check_thread = UpdateCheckThread(ignore_options, self)
+        self.check_thread.checked.connect(self._on_checked, Qt.QueuedConnection)
+
+    def start(self) -> None:
+        UpdateCheckService._running.add(self)
+        self.check_thread.start()
+
+    def _on_checked(self, packages: list[Package], deferred: list[Package]) -> None:
+        self.check_thread.wait()
+        UpdateCheckService._running.discard(self)
+        apply_update_check_results(packages, deferred)
+
+
+def check_for_updates_in_background(ignore_options: bool = False) -> UpdateCheckService:
+    service = UpdateCheckService(ignore_options)
+    service.start()
+    return service
@@ -93,6 +93,39 @@ class UpdateOptions:
     def last_check_time(self) -> int | float:
         return self.get_field('last_update_check') or 0
 
+    def set_deferred_update_checks(self, sources: list[str]) -> None:
+        self.set_field('deferred_update_checks', sources)
+
+    def deferred_update_checks(self) -> list[str]:
+        return self.get_field('deferred_update_checks') or []
+
+    def set_api_cache_max_entries(self, max_entries: int) -> None:
+        self.set_field('api_cache_max_entries', max_entries)
+
+    def api_cache_max_entries(self) -> int:
+        return self.get_field('api_cache_max_entries') or 2000
+
+    def set_api_cache_max_size(self, max_size: int) -> None:
+        self.set_field('api_cache_max_size', max_size)
+
+    def api_cache_max_size(self) -> int:
+        # In megabytes
+        return self.get_field('api_cache_max_size') or 64
+
+    def set_archive_cache_max_size(self, max_size: int) -> None:
+        self.set_field('archive_cache_max_size', max_size)
+
+    def archive_cache_max_size(self) -> int:
+        # In megabytes
+        return self.get_field('archive_cache_max_size') or 2048
+
+    def set_discovery_workers(self, workers: int) -> None:
+        self.set_field('discovery_workers', workers)
+
+    def discovery_workers(self) -> int:
+        # Threads used to find and read the installed packages
+        return self.get_field('discovery_workers') or 8
+
     def set_check_on_startup_for_package(self, package: Package, enable: bool) -> None:
         self.set_field_for_package(package, 'check_on_startup', enable)
 
@@ -0,0 +1,98 @@
+import logging
+from time import sleep
+from time import time
+
+import pytest
+from PySide2.QtCore import QCoreApplication
+
+from package_manager.rate_limit import QuotaExhaustedError
+
+
+update = pytest.importorskip('package_manager.update', reason='Needs Houdini')
+
+
+class Options:
+    deferred = []
+    last_check_time = None
+
+    def set_deferred_update_checks(self, sources: list[str]) -> None:
+        Options.deferred = sources
+
+    def set_last_check_time(self, check_time: float) -> None:
+        Options.last_check_time = check_time
+
+
+class Package:
+    def __init__(self, source: str) -> None:
+        self.source = source
+
+
+@pytest.fixture
+def options(monkeypatch):
+    Options.deferred = []
+    Options.last_check_time = None
+    monkeypatch.setattr(update, 'UpdateOptions', Options)
+    return Options
+
+
+@pytest.fixture
+def packages(monkeypatch):
+    packages = [Package('owner/a'), Package('owner/b')]
+    monkeypatch.setattr(update, 'packages_to_check', lambda ignore_options=False: packages)
+    return packages
+
+
+def run_check(ignore_options: bool = False) -> list[tuple[list, list]]:
+    results = []
+    thread = update.UpdateCheckThread(ignore_options)
+    thread.checked.connect(lambda packages, deferred: results.append((packages, deferred)))
+    thread.run()
+    return results
+
+
+def test_deferred_checks(monkeypatch, options, packages):
+    monkeypatch.setattr(update, 'find_updates', lambda packages: ([], packages[1:]))
+    assert run_check() == [([], packages[1:])]
+
+    update.apply_update_check_results([], packages[1:])
+    assert options.deferred == ['owner/b']
+    assert options.last_check_time is None  # Checked again on the next start
+
+    update.apply_update_check_results([], [])
+    assert options.deferred == []
+    assert options.last_check_time is not None
+
+
+@pytest.mark.parametrize('error', (OSError('Offline'), QuotaExhaustedError(0)))
+def test_expected_errors(monkeypatch, caplog, packages, error):
+    def find_updates(packages):
+        raise error
+
+    monkeypatch.setattr(update, 'find_updates', find_updates)
+    assert run_check() == [([], [])]
+    assert not caplog.records
+
+
+def test_unexpected_errors_are_logged(monkeypatch, caplog, packages):
+    def find_updates(packages):
+        raise KeyError('bug')
+
+    monkeypatch.setattr(update, 'find_updates', find_updates)
+    with caplog.at_level(logging.ERROR):
+        assert run_check() == [([], [])]
+    assert caplog.records[0].exc_info[0] is KeyError
+
+
+def test_background_service(monkeypatch, packages):
+    app = QCoreApplication.instance() or QCoreApplication([])
+    applied = []
+    monkeypatch.setattr(update, 'find_updates', lambda packages: (packages[:1], packages[1:]))
+    monkeypatch.setattr(update, 'apply_update_check_results', lambda *results: applied.append(results))
+
+    service = update.check_for_updates_in_background()
+    deadline = time() + 5
+    while not applied and time() < deadline:
+        app.processEvents()
+        sleep(0.01)
+    assert applied == [(packages[:1], packages[1:])]
+    assert service not in update.UpdateCheckService._running
@@ -0,0 +1,165 @@
+import json
+import os
+import threading
+from collections.abc import Collection
+from operator import itemgetter
+
+from package_manager import network
+from package_manager.version import Version
+from package_manager.version import VersionRange
+from package_manager.web_package import WebPackage
+
+
+CATALOGUE_URL = 'https://raw.githubusercontent.com/anvdev/Houdini-Package-List/master/data.json'
+
+
+# The last downloaded catalogue with its validators, stored as a single JSON file
+class CatalogueCache:
+    def __init__(self, file_path: str) -> None:
+        self.file_path = file_path
+
+        self.data: dict | None = None
+        self.etag: str | None = None
+        self.last_modified: str | None = None
+
+    def load(self) -> bool:
+        try:
+            with open(self.file_path) as file:
+                cache_data = json.load(file)
+            self.data = cache_data['data']
+        except (OSError, ValueError, KeyError):
+            return False
+        self.etag = cache_data.get('etag')
+        self.last_modified = cache_data.get('last_modified')
+        return True
+
+    def save(self) -> None:
+        # Written next to the target and moved over it, so a broken file is never left behind
+        temp_file_path = self.file_path + '.tmp'
+        with open(temp_file_path, 'w') as file:
+            json.dump({'etag': self.etag, 'last_modified': self.last_modified, 'data': self.data}, file)
+        os.replace(temp_file_path, self.file_path)
+
+
+def update_catalogue(cache: CatalogueCache, url: str = CATALOGUE_URL) -> bool:
+    # Returns True when the catalogue has changed. Only the validators are sent when it has not.
+    # On network errors the cached catalogue is kept for offline use.
+    headers = {}
+    if cache.data is not None:
+        if cache.etag:
+            headers['If-None-Match'] = cache.etag
+        elif cache.last_modified:
+            headers['If-Modified-Since'] = cache.last_modified
+
+    # Retries with backoff are handled by the session
+    try:
+        response = network.get(url, headers=headers)
+        if response.status_code != 200:  # 304 included
+            return False
+        data = json.loads(response.text)
+    except (OSError, ValueError):
+        return False
+
+    changed = data != cache.data
+    cache.data = data
+    cache.etag = response.headers.get('ETag')
+    cache.last_modified = response.headers.get('Last-Modified')
+    try:
+        cache.save()
+    except OSError:
+        pass
+    return changed
+
+
+def make_web_package(name: str, package_data: dict) -> WebPackage:
+    return WebPackage(
+        name,
+        package_data.get('description'),
+        package_data.get('author'),
+        package_data['source'],
+        package_data['source_type'],
+        package_data.get('hversion'),
+        package_data.get('hlicense'),
+        package_data.get('status'),
+        package_data.get('setup_schema'),
+    )
+
+
+# Built once per catalogue: visible packages sorted by name, grouped by their Houdini version
+# range pattern and by status and license. Every distinct version range is parsed and checked
+# once per Houdini version, so filtering costs O(patterns + matching packages).
+class CatalogueIndex:
+    def __init__(self, data: dict) -> None:
+        self.packages: list[WebPackage] = []
+        self.ranges: dict[str, list[int]] = {}  # Version range pattern to package indices
+        self.statuses: dict[str | None, set[int]] = {}
+        self.licenses: dict[str | None, set[int]] = {}
+
+        self._parsed_ranges: dict[str, VersionRange | None] = {}
+        self._matching: dict[str, tuple[int, ...]] = {}  # Houdini version to package indices
+
+        for name, package_data in sorted(data.items(), key=itemgetter(0)):
+            if not package_data.get('visible', True):
+                continue
+            index = len(self.packages)
+            self.packages.append(make_web_package(name, package_data))
+            self.ranges.setdefault(package_data.get('hversion', '*').strip(), []).append(index)
+            self.statuses.setdefault(package_data.get('status'), set()).add(index)
+            self.licenses.setdefault(package_data.get('hlicense'), set()).add(index)
+
+    def version_range(self, pattern: str) -> VersionRange | None:
+        if pattern not in self._parsed_ranges:
+            try:
+                self._parsed_ranges[pattern] = VersionRange.from_pattern(pattern)
+            except ValueError:  # Broken entries must not hide the whole catalogue
+                self._parsed_ranges[pattern] = None
+        return self._parsed_ranges[pattern]
+
+    def matching(self, hversion: str) -> tuple[int, ...]:
+        # Indices of the packages supporting the Houdini version, in name order
+        if hversion not in self._matching:
+            version = Version(hversion)
+            indices = []
+            for pattern, pattern_indices in self.ranges.items():
+                version_range = self.version_range(pattern)
+                if version_range is not None and version in version_range:
+                    indices.extend(pattern_indices)
+            self._matching[hversion] = tuple(sorted(indices))
+        return self._matching[hversion]
+
+    def filter(
+            self,
+            hversion: str,
+            statuses: Collection[str | None] | None = None,
+            licenses: Collection[str | None] | None = None,
+    ) -> list[WebPackage]:
+        indices = self.matching(hversion)
+        if statuses is not None:
+            allowed = set().union(*(self.statuses.get(status, ()) for status in statuses))
+            indices = [index for index in indices if index in allowed]
+        if licenses is not None:
+            allowed = set().union(*(self.licenses.get(hlicense, ()) for hlicense in licenses))
+            indices = [index for index in indices if index in allowed]
+        return [self.packages[index] for index in indices]
+
+
+_last_index: tuple[str, CatalogueIndex] | None = None
+_last_index_lock = threading.Lock()
+
+
+def catalogue_index(data: dict, key: str | None = None) -> CatalogueIndex:
+    # The index of the last catalogue is reused while its key (ETag) is the same
+    global _last_index
+    with _last_index_lock:
+        if key is not None and _last_index is not None and _last_index[0] == key:
+            return _last_index[1]
+    index = CatalogueIndex(data)
+    if key is not None:
+        with _last_index_lock:
+            _last_index = key, index
+    return index
+
+
+def web_packages(data: dict, hversion: str) -> list[WebPackage]:
+    # Visible packages supporting the Houdini version, sorted by name
+    return CatalogueIndex(data).filter(hversion)
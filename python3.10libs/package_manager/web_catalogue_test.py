@@ -0,0 +1,122 @@
+import hashlib
+import json
+import socket
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+from package_manager.web_catalogue import CatalogueCache
+from package_manager.web_catalogue import CatalogueIndex
+from package_manager.web_catalogue import catalogue_index
+from package_manager.web_catalogue import update_catalogue
+from package_manager.web_catalogue import web_packages
+
+
+DATA = {
+    'b_package': {'source': 'owner/b', 'source_type': 'github', 'hversion': '19.0+'},
+    'a_package': {'source': 'owner/a', 'source_type': 'github', 'description': 'A'},
+    'hidden': {'source': 'owner/hidden', 'source_type': 'github', 'visible': False},
+    'old': {'source': 'owner/old', 'source_type': 'github', 'hversion': '17.0-18.5'},
+    'broken': {'source': 'owner/broken', 'source_type': 'github', 'hversion': '18'},
+}
+
+
+def test_web_packages():
+    packages = web_packages(DATA, '19.5.303')
+    assert [package.name for package in packages] == ['a_package', 'b_package']
+    assert packages[0].description == 'A'
+    assert packages[1].hversion == '19.0+'
+    assert [package.name for package in web_packages(DATA, '17.5.100')] == ['a_package', 'old']
+
+
+class CatalogueHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self) -> None:
+        body = json.dumps(self.server.data).encode()
+        etag = '"' + hashlib.sha1(body, usedforsecurity=False).hexdigest() + '"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            body = b''
+        else:
+            self.send_response(200)
+            self.send_header('ETag', etag)
+        self.server.requests.append(304 if not body else 200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def server(http_server):
+    return http_server(CatalogueHandler, data={'a_package': {'source': 'owner/a', 'source_type': 'github'}})
+
+
+@pytest.fixture
+def url(server):
+    return f'{server.url}/data.json'
+
+
+def test_revalidation(tmp_path, server, url):
+    file_path = str(tmp_path / 'catalogue.json')
+    cache = CatalogueCache(file_path)
+    assert not cache.load()
+    assert update_catalogue(cache, url)
+    assert cache.data == server.data
+
+    cache = CatalogueCache(file_path)
+    assert cache.load()
+    assert not update_catalogue(cache, url)
+    assert server.requests == [200, 304]
+
+    server.data = {**server.data, 'b_package': {'source': 'owner/b', 'source_type': 'github'}}
+    assert update_catalogue(cache, url)
+    assert 'b_package' in cache.data
+
+
+def test_offline(tmp_path, server, url):
+    file_path = str(tmp_path / 'catalogue.json')
+    update_catalogue(CatalogueCache(file_path), url)
+
+    cache = CatalogueCache(file_path)
+    assert cache.load()
+    with socket.socket() as closed_socket:
+        closed_socket.bind(('127.0.0.1', 0))
+        port = closed_socket.getsockname()[1]
+    assert not update_catalogue(cache, f'http://127.0.0.1:{port}/data.json')
+    assert cache.data == server.data
+
+
+def test_index():
+    data = {
+        f'package{i:03}': {
+            'source': f'owner/package{i}',
+            'source_type': 'github',
+            'hversion': ('*', '19.0+', '17.0-18.5', '18')[i % 4],
+            'status': ('stable', 'beta')[i % 2],
+            'hlicense': ('commercial', 'apprentice', None)[i % 3],
+        }
+        for i in range(100)
+    }
+    index = CatalogueIndex(data)
+    assert len(index.ranges) == 4
+
+    packages = index.filter('19.5.303')
+    assert [package.name for package in packages] == [f'package{i:03}' for i in range(100) if i % 4 in (0, 1)]
+    assert index.matching('19.5.303') is index.matching('19.5.303')
+
+    beta = index.filter('19.5.303', statuses=('beta',))
+    assert all(package.status == 'beta' for package in beta)
+    assert len(beta) == 25
+    no_license = index.filter('17.5.100', licenses=(None,))
+    assert {package.hversion for package in no_license} == {'*', '17.0-18.5'}
+
+
+def test_index_is_reused():
+    index = catalogue_index(DATA, '"etag"')
+    assert catalogue_index(dict(DATA), '"etag"') is index
+    assert catalogue_index(DATA, '"other"') is not index
+    assert catalogue_index(DATA) is not catalogue_index(DATA)
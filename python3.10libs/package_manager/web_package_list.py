@@ -1,73 +1,138 @@
-import json
-from operator import itemgetter
-from time import sleep
 from typing import Any
 
 import hou
-import requests
 from PySide2.QtCore import QAbstractListModel
 from PySide2.QtCore import QModelIndex
 from PySide2.QtCore import QObject
+from PySide2.QtCore import QRectF
+from PySide2.QtCore import QSortFilterProxyModel
 from PySide2.QtCore import Qt
+from PySide2.QtCore import QThread
+from PySide2.QtCore import Signal
+from PySide2.QtGui import QPainter
+from PySide2.QtGui import QPaintEvent
+from PySide2.QtGui import QTextOption
 from PySide2.QtWidgets import QListView
 
-from package_manager.version import Version
-from package_manager.version import VersionRange
+from package_manager.search_index import SearchIndex
+from package_manager.web_catalogue import CatalogueCache
+from package_manager.web_catalogue import catalogue_index
+from package_manager.web_catalogue import update_catalogue
 from package_manager.web_package import WebPackage
 
 
+# Rows inserted into the model at once while the catalogue is loading
+BATCH_SIZE = 100
+
+
+# The cached catalogue is shown at once, then it is revalidated and replaced if it has changed
+class CatalogueLoader(QThread):
+    # Signals
+    batch_loaded = Signal(list)
+    reloaded = Signal()
+
+    # Keeps cancelled loaders alive until their threads finish
+    _running = set()
+
+    def __init__(self, hversion: str, cache_file_path: str, parent: QObject | None = None) -> None:
+        super(CatalogueLoader, self).__init__(parent)
+
+        self.hversion = hversion
+        self.cache_file_path = cache_file_path
+
+    def run(self) -> None:
+        cache = CatalogueCache(self.cache_file_path)
+        is_cached = cache.load()
+        if is_cached:
+            self.emit_packages(catalogue_index(cache.data, cache.etag).filter(self.hversion))
+
+        if not update_catalogue(cache) or self.isInterruptionRequested():
+            return
+        if is_cached:
+            self.reloaded.emit()
+        self.emit_packages(catalogue_index(cache.data, cache.etag).filter(self.hversion))
+
+    def emit_packages(self, packages: list[WebPackage]) -> None:
+        for start in range(0, len(packages), BATCH_SIZE):
+            if self.isInterruptionRequested():
+                return
+            self.batch_loaded.emit(packages[start:start + BATCH_SIZE])
+
+    def cancel(self) -> None:
+        # The network request can't be aborted, the results are dropped instead
+        self.requestInterruption()
+        self.batch_loaded.disconnect()
+        self.reloaded.disconnect()
+        if self.isRunning():
+            self.setParent(None)
+            CatalogueLoader._running.add(self)
+            self.finished.connect(self._on_cancelled_finished)
+
+    def _on_cancelled_finished(self) -> None:
+        CatalogueLoader._running.discard(self)
+
+
 class WebPackageListModel(QAbstractListModel):
+    # Signals
+    loading_changed = Signal(bool)
+
     def __init__(self, parent: QObject | None = None) -> None:
         super(WebPackageListModel, self).__init__(parent)
 
-        self.__data = ()
+        self.__data = []
+        self.__loader = None
         self.update_data()
 
     def update_data(self, packages: list[WebPackage] | None = None) -> None:
+        # Without packages, the catalogue is loaded in the background and rows are added as they arrive
+        self.cancel()
         self.beginResetModel()
-        hversion = Version(hou.applicationVersionString())
-        items = []
+        self.__data = list(packages or ())
+        self.endResetModel()
         if packages:
-            items = packages
-        else:
-            attempts = 3
-            while attempts != 0:
-                try:
-                    r = requests.get('https://raw.githubusercontent.com/anvdev/'
-                                     'Houdini-Package-List/master/data.json')
-                    data = json.loads(r.text)
-                    if hou.getenv('username') == 'MarkWilson':  # Debug only
-                        with open(r'C:\Users\MarkWilson\Documents\Houdini-Package-List\data.json') as file:
-                            data = json.load(file)
-                    break
-                except OSError:
-                    attempts -= 1
-                    sleep(0.125)
-            else:
-                data = {}
-
-            for name, package_data in sorted(data.items(), key=itemgetter(0)):
-                if not package_data.get('visible', True):
-                    continue
-
-                if hversion not in VersionRange.from_pattern(package_data.get('hversion', '*')):
-                    continue
-
-                items.append(WebPackage(
-                    name,
-                    package_data.get('description'),
-                    package_data.get('author'),
-                    package_data['source'],
-                    package_data['source_type'],
-                    package_data.get('hversion'),
-                    package_data.get('hlicense'),
-                    package_data.get('status'),
-                    package_data.get('setup_schema'),
-                ))
-
-        self.__data = tuple(items)
+            return
+
+        cache_file_path = hou.expandString('$HOUDINI_USER_PREF_DIR/package_manager.web_catalogue.json')
+        self.__loader = CatalogueLoader(hou.applicationVersionString(), cache_file_path, self)
+        self.__loader.batch_loaded.connect(self._on_batch_loaded, Qt.QueuedConnection)
+        self.__loader.reloaded.connect(self._on_reloaded, Qt.QueuedConnection)
+        self.__loader.finished.connect(self._on_loader_finished, Qt.QueuedConnection)
+        self.__loader.start()
+        self.loading_changed.emit(True)
+
+    def is_loading(self) -> bool:
+        return self.__loader is not None
+
+    def cancel(self) -> None:
+        if self.__loader is None:
+            return
+        self.__loader.finished.disconnect(self._on_loader_finished)
+        self.__loader.cancel()
+        self.__loader = None
+        self.loading_changed.emit(False)
+
+    def _on_batch_loaded(self, packages: list[WebPackage]) -> None:
+        if self.sender() is not self.__loader:
+            return  # Queued before the loader was cancelled
+        first = len(self.__data)
+        self.beginInsertRows(QModelIndex(), first, first + len(packages) - 1)
+        self.__data.extend(packages)
+        self.endInsertRows()
+
+    def _on_reloaded(self) -> None:
+        if self.sender() is not self.__loader:
+            return
+        self.beginResetModel()
+        self.__data = []
         self.endResetModel()
 
+    def _on_loader_finished(self) -> None:
+        if self.sender() is not self.__loader:
+            return
+        self.__loader.deleteLater()
+        self.__loader = None
+        self.loading_changed.emit(False)
+
     def rowCount(self, parent: QModelIndex) -> int:
         return len(self.__data)
 
@@ -79,8 +144,89 @@ class WebPackageListModel(QAbstractListModel):
             return item
 
 
+class WebPackageFilterModel(QSortFilterProxyModel):
+    # Signals
+    loading_changed = Signal(bool)
+
+    FIELDS = ('name', 'description', 'author', 'status', 'license')
+
+    def __init__(self, parent: QObject | None = None) -> None:
+        super(WebPackageFilterModel, self).__init__(parent)
+
+        self.__query = ''
+        # Rows of the source model are indexed as they arrive,
+        # the rows matching the query are found once per query or index change
+        self.__index = SearchIndex(self.FIELDS)
+        self.__matching = None
+
+    def setSourceModel(self, model: WebPackageListModel) -> None:
+        super(WebPackageFilterModel, self).setSourceModel(model)
+        model.modelAboutToBeReset.connect(self._on_source_about_to_be_reset)
+        model.loading_changed.connect(self.loading_changed)
+
+    def set_query(self, query: str) -> None:
+        self.__query = query
+        matching = self.__matching
+        self.update_matching()
+        if self.__matching == matching:
+            return  # Typing a word further often matches the same rows
+        # A full refilter is cheaper than removing and inserting the rows one range at a time
+        self.invalidate()
+
+    def is_filtered(self) -> bool:
+        return self.__matching is not None
+
+    def is_loading(self) -> bool:
+        return self.sourceModel().is_loading()
+
+    def update_matching(self) -> None:
+        model = self.sourceModel()
+        for row in range(self.__index.count, model.rowCount(QModelIndex())):
+            package = model.index(row, 0).data(Qt.UserRole)
+            self.__index.add({
+                'name': package.name,
+                'description': package.description,
+                'author': package.author,
+                'status': package.status,
+                'license': package.hlicense,
+            })
+        self.__matching = self.__index.search(self.__query)
+
+    def filterAcceptsRow(self, source_row: int, source_parent: QModelIndex) -> bool:
+        # Called for every row, must stay cheap
+        if source_row >= self.__index.count:  # Inserted since the last update
+            self.update_matching()
+        matching = self.__matching
+        return matching is None or source_row in matching
+
+    def _on_source_about_to_be_reset(self) -> None:
+        self.__index = SearchIndex(self.FIELDS)
+        self.__matching = self.__index.search(self.__query)
+
+
 class WebPackageListView(QListView):
     def __init__(self) -> None:
         super(WebPackageListView, self).__init__()
         self.setAlternatingRowColors(True)
         self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setUniformItemSizes(True)  # Layout does not query every row
+
+    def setModel(self, model: WebPackageListModel | WebPackageFilterModel) -> None:
+        super(WebPackageListView, self).setModel(model)
+        model.loading_changed.connect(self.viewport().update)
+
+    def paintEvent(self, event: QPaintEvent) -> None:
+        super(WebPackageListView, self).paintEvent(event)
+        model = self.model()
+        if model is None or model.rowCount(QModelIndex()):
+            return
+        # Placeholder
+        painter = QPainter(self.viewport())
+        painter.setPen(self.palette().placeholderText().color())
+        if model.is_loading():
+            text = 'Loading packages...'
+        elif isinstance(model, WebPackageFilterModel) and model.is_filtered():
+            text = 'No matching packages'
+        else:
+            text = 'No packages'
+        painter.drawText(QRectF(self.viewport().rect()), text, QTextOption(Qt.AlignCenter))
@@ -0,0 +1,137 @@
+import os
+import shutil
+import threading
+import zipfile
+import zlib
+from collections.abc import Collection
+from concurrent.futures import ThreadPoolExecutor
+
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class ExtractStats:
+    __slots__ = 'extracted', 'skipped', 'removed', 'extracted_bytes'
+
+    def __init__(self) -> None:
+        self.extracted = 0
+        self.skipped = 0
+        self.removed = 0
+        self.extracted_bytes = 0
+
+
+def archive_root(names: Collection[str]) -> str:
+    # Common top folder of all the members, like "owner-repo-1a2b3c4/" in GitHub archives
+    if not names:
+        return ''
+    first_name = next(iter(names))
+    if '/' not in first_name:
+        return ''
+    root = first_name.split('/', 1)[0] + '/'
+    if all(name.startswith(root) for name in names):
+        return root
+    return ''
+
+
+def member_path(name: str, root: str) -> str | None:
+    if root and name.startswith(root):
+        name = name[len(root):]
+    name = os.path.normpath(name.replace('\\', '/')).replace('\\', '/')
+    if name in ('.', '') or name.startswith(('../', '/')) or name == '..' or os.path.isabs(name):
+        return None  # Unsafe or empty
+    return name
+
+
+def file_crc32(file_path: str) -> int:
+    crc = 0
+    with open(file_path, 'rb') as file:
+        while chunk := file.read(CHUNK_SIZE):
+            crc = zlib.crc32(chunk, crc)
+    return crc
+
+
+def is_unchanged(file_path: str, info: zipfile.ZipInfo) -> bool:
+    try:
+        if os.path.getsize(file_path) != info.file_size:
+            return False
+    except OSError:
+        return False
+    return file_crc32(file_path) == info.CRC
+
+
+def extract_zip(
+        file_path: str,
+        dst_path: str,
+        strip_root: bool = True,
+        skip_unchanged: bool = True,
+        remove_stale: bool = True,
+        keep: Collection[str] = (),
+        max_workers: int | None = None,
+) -> ExtractStats:
+    # Members are extracted in parallel, every worker thread reads the archive through its own handle.
+    # When dst_path already contains a previous version, files with the same size and CRC are left
+    # untouched and files missing from the archive are removed, except for the `keep` ones.
+    stats = ExtractStats()
+    with zipfile.ZipFile(file_path) as file:
+        infos = [info for info in file.infolist() if not info.is_dir()]
+    root = archive_root([info.filename for info in infos]) if strip_root else ''
+
+    members = {}
+    for info in infos:
+        name = member_path(info.filename, root)
+        if name is not None:
+            members[name] = info
+
+    dst_path = os.path.normpath(dst_path)
+    if remove_stale and os.path.isdir(dst_path):
+        for folder, _, files in os.walk(dst_path):
+            for name in files:
+                full_path = os.path.join(folder, name)
+                rel_path = os.path.relpath(full_path, dst_path).replace('\\', '/')
+                if rel_path not in members and rel_path not in keep:
+                    os.remove(full_path)
+                    stats.removed += 1
+        for folder, _, _ in os.walk(dst_path, topdown=False):
+            if folder != dst_path and not os.listdir(folder):
+                os.rmdir(folder)
+
+    handles = []
+    handles_lock = threading.Lock()
+    local = threading.local()
+    stats_lock = threading.Lock()
+
+    def archive() -> zipfile.ZipFile:
+        if not hasattr(local, 'archive'):
+            local.archive = zipfile.ZipFile(file_path)
+            with handles_lock:
+                handles.append(local.archive)
+        return local.archive
+
+    def extract(item: tuple[str, zipfile.ZipInfo]) -> None:
+        name, info = item
+        target_path = os.path.join(dst_path, name)
+        if skip_unchanged and is_unchanged(target_path, info):
+            with stats_lock:
+                stats.skipped += 1
+            return
+        os.makedirs(os.path.dirname(target_path), exist_ok=True)
+        if os.path.lexists(target_path):
+            os.remove(target_path)  # Never write through, it may be a hard link to another copy
+        with archive().open(info) as src, open(target_path, 'wb') as dst:
+            shutil.copyfileobj(src, dst, CHUNK_SIZE)
+        with stats_lock:
+            stats.extracted += 1
+            stats.extracted_bytes += info.file_size
+
+    os.makedirs(dst_path, exist_ok=True)
+    max_workers = max_workers or min(8, os.cpu_count() or 1)
+    # Large files first, so they do not end up alone at the tail
+    items = sorted(members.items(), key=lambda item: item[1].file_size, reverse=True)
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='package_manager') as executor:
+            for _ in executor.map(extract, items):
+                pass
+    finally:
+        for handle in handles:
+            handle.close()
+    return stats
@@ -0,0 +1,36 @@
+import zipfile
+
+from package_manager.zip_extract import archive_root
+from package_manager.zip_extract import extract_zip
+from package_manager.zip_extract import member_path
+
+
+def make_zip(path, files):
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as file:
+        for name, data in files.items():
+            file.writestr(name, data)
+
+
+def test_root_is_stripped_only_as_prefix():
+    assert archive_root(['repo-1a2b/', 'repo-1a2b/otls/repo-1a2b/a.hda']) == 'repo-1a2b/'
+    assert archive_root(['a/x', 'b/y']) == ''
+    assert member_path('repo-1a2b/otls/repo-1a2b/a.hda', 'repo-1a2b/') == 'otls/repo-1a2b/a.hda'
+    assert member_path('repo/../../evil', 'repo/') is None
+
+
+def test_update_skips_unchanged_and_removes_stale(tmp_path):
+    archive_path = tmp_path / 'v1.zip'
+    make_zip(archive_path, {'repo/a.txt': 'a', 'repo/b/c.txt': 'c', 'repo/old.txt': 'old'})
+    dst = tmp_path / 'package'
+    stats = extract_zip(str(archive_path), str(dst), max_workers=4)
+    assert stats.extracted == 3
+    assert (dst / 'b' / 'c.txt').read_text() == 'c'
+
+    (dst / 'package.setup').write_text('{}')
+    archive_path = tmp_path / 'v2.zip'
+    make_zip(archive_path, {'repo/a.txt': 'a', 'repo/b/c.txt': 'changed', 'repo/new.txt': 'new'})
+    stats = extract_zip(str(archive_path), str(dst), keep=('package.setup',))
+    assert (stats.extracted, stats.skipped, stats.removed) == (2, 1, 1)
+    assert (dst / 'b' / 'c.txt').read_text() == 'changed'
+    assert not (dst / 'old.txt').exists()
+    assert (dst / 'package.setup').exists()
@@ -5,10 +5,10 @@ import hou
 if hou.isUIAvailable():
     from time import time
 
-    from package_manager import UpdateOptions, check_for_updates
+    from package_manager import UpdateOptions, check_for_updates_in_background
 
     options = UpdateOptions()
     current_time = time()
     # It should be over 4 hours since the last check.
     if options.check_on_startup() and current_time - options.last_check_time() > timedelta(hours=4).total_seconds():
-        check_for_updates()
+        check_for_updates_in_background()